@@ -17,15 +17,16 @@ _logger = logging.getLogger(__name__)
 
 def get_version():
     """Get version from package metadata or pyproject.toml."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        # Python < 3.8 fallback
+        from importlib_metadata import PackageNotFoundError, version
+
     try:
         # First try to get version from installed package metadata
-        try:
-            from importlib.metadata import version
-        except ImportError:
-            # Python < 3.8 fallback
-            from importlib_metadata import version
         return version("samosa")
-    except Exception as e:
+    except PackageNotFoundError as e:
         _logger.info("Could not get version from package metadata: %s", e)
 
     try:
@@ -37,9 +38,8 @@ def get_version():
         pyproject_path = project_root / "pyproject.toml"
 
         if pyproject_path.exists():
-            with open(pyproject_path, "rb") as f:
-                config = tomllib.load(f)
-                return config.get("project", {}).get("version", "unknown")
+            config = tomllib.loads(pyproject_path.read_text(encoding="utf-8"))
+            return config.get("project", {}).get("version", "unknown")
     except Exception as e:
         _logger.warning("Could not get version from pyproject.toml: %s", e)
 
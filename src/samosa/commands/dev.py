@@ -1,9 +1,101 @@
 """Development and testing commands."""
 
+from functools import lru_cache
+import os
+from pathlib import Path
+import shutil
+from typing import NamedTuple, Tuple
+
 import click
 
 from samosa.utils import AliasedGroup, invoked
 
+CLEAN_TARGETS = (
+    "build",
+    "dist",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".ruff_cache",
+    "htmlcov",
+    ".coverage",
+    "coverage.xml",
+)
+
+TEST_DIRS = ("tests", "test")
+
+# Never descended into by clean: installed packages keep their egg-info there
+SKIP_DIRS = ("node_modules", "venv", "env", "site-packages")
+
+
+class LayoutInfo(NamedTuple):
+    """Python source layout of a project directory."""
+
+    has_src: bool
+    test_dirs: Tuple[str, ...]
+    packages: Tuple[str, ...]
+
+
+@lru_cache(maxsize=None)
+def classify_layout(target_dir):
+    """Classify the layout of ``target_dir`` with a single directory scan."""
+    has_src = False
+    found_test_dirs = set()
+    packages = []
+
+    with os.scandir(target_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            if entry.name == "src":
+                has_src = True
+            elif entry.name in TEST_DIRS:
+                found_test_dirs.add(entry.name)
+            elif os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                packages.append(entry.name)
+
+    return LayoutInfo(
+        has_src=has_src,
+        test_dirs=tuple(d for d in TEST_DIRS if d in found_test_dirs),
+        packages=tuple(sorted(packages)),
+    )
+
+
+def get_python_paths(target_dir=None, include_tests=False):
+    """Return the space-separated source paths to check in ``target_dir``."""
+    layout = classify_layout(target_dir or Path.cwd())
+    paths = ["src"] if layout.has_src else []
+    if include_tests:
+        paths.extend(layout.test_dirs)
+    if not paths:
+        # Non-standard layout: fall back to top-level packages
+        paths = list(layout.packages)
+    return " ".join(paths) if paths else "."
+
+
+def get_target_directory():
+    """Return the git repository root containing the cwd, or the cwd itself."""
+    cwd = Path.cwd()
+    for parent in [cwd, *cwd.parents]:
+        if (parent / ".git").exists():
+            return parent
+    return cwd
+
+
+def _work_dir(c):
+    """Return the directory commands run in: the root chosen by check, else the cwd."""
+    return getattr(c, "_samosa_target", None) or Path.cwd()
+
+
+def _ensure_target(c):
+    """Resolve the target directory once per CLI invocation and cache it on ``c``."""
+    target_dir = getattr(c, "_samosa_target", None)
+    if target_dir is None:
+        target_dir = get_target_directory()
+        if target_dir != Path.cwd():
+            click.echo(f"Using git repository root: {target_dir}")
+        c._samosa_target = target_dir
+    return target_dir
+
 
 @click.group(cls=AliasedGroup)
 def dev():
@@ -17,16 +109,10 @@ def dev():
 @invoked
 def test(c, cctx):
     """Run tests with pytest (proxy all arguments to pytest)."""
-    from pathlib import Path
-
     cmd = ["pytest"]
 
     if not cctx.args:
-        test_dirs = ["tests", "test"]
-        for test_dir in test_dirs:
-            if Path(test_dir).exists():
-                cmd.append(test_dir)
-                break
+        cmd.extend(classify_layout(_work_dir(c)).test_dirs[:1])
     else:
         cmd.extend(cctx.args)
 
@@ -59,10 +145,79 @@ def lint(c, cctx, fix):
 
 
 @dev.command(name="mypy")
+@click.option("--tests", is_flag=True, help="Type check the test directories too")
+@invoked
+def mypy(c, cctx, tests):
+    """Run type checking with mypy (src/, or top-level packages without one)."""
+    c.run(f"mypy {get_python_paths(_work_dir(c), include_tests=tests)}")
+
+
+@dev.command(name="check")
+@click.option("--fix", is_flag=True, help="Fix linting issues automatically")
+@click.option("--fast", is_flag=True, help="Skip running tests")
+@click.pass_context
+def check(cctx, fix, fast):
+    """Run all quality checks (lint, type check and tests)."""
+    click.echo("🔍 Running quality checks...")
+
+    # Run every check from the repository root; the subcommands share the
+    # invoke context and pick the resolved root up from it
+    c = cctx.obj["invoke_ctx"]
+    with c.cd(str(_ensure_target(c))):
+        cctx.invoke(lint, fix=fix)
+        cctx.invoke(mypy)
+        if fast:
+            click.echo("⏩ Skipping pytest (--fast)")
+        else:
+            cctx.invoke(test)
+
+    click.echo("🎉 All checks passed!")
+
+
+def _generated_dirs(root, egg_info=False):
+    """Yield __pycache__ (and optionally *.egg-info) dirs under ``root``.
+
+    Virtualenvs and dot-directories are never entered.
+    """
+    for dirpath, dirnames, _ in os.walk(root):
+        keep = []
+        for name in dirnames:
+            if name == "__pycache__" or (egg_info and name.endswith(".egg-info")):
+                yield os.path.join(dirpath, name)
+            elif not (
+                name.startswith(".")
+                or name in SKIP_DIRS
+                or os.path.isfile(os.path.join(dirpath, name, "pyvenv.cfg"))
+            ):
+                keep.append(name)
+        # Prune in place so os.walk never enters skipped or removed dirs
+        dirnames[:] = keep
+
+
+@dev.command(name="clean")
+@click.option(
+    "--all",
+    "clean_all",
+    is_flag=True,
+    help="Also remove *.egg-info metadata (breaks editable installs until reinstalled)",
+)
 @invoked
-def mypy(c, cctx):
-    """Run type checking with mypy."""
-    c.run("mypy src/")
+def clean(c, _, clean_all):
+    """Clean build artifacts and caches."""
+    target_dir = _ensure_target(c)
+
+    # Pure pathlib/shutil: no shell, find or rm processes, works on Windows too
+    for target in CLEAN_TARGETS:
+        path = target_dir / target
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        elif path.exists():
+            path.unlink()
+
+    for path in list(_generated_dirs(target_dir, egg_info=clean_all)):
+        shutil.rmtree(path, ignore_errors=True)
+
+    click.echo("🧹 Cleaned build artifacts and caches")
 
 
 dev.add_command_with_aliases(format_cmd, name="format", aliases=["fmt"])
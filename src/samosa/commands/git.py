@@ -1,13 +1,219 @@
 """Git-related commands. There are better tools available, it's all about personalization"""
 
-from datetime import datetime
+from functools import lru_cache
+import os
 from pathlib import Path
+import shlex
+import subprocess
+import time
+import webbrowser
 
 import click
-from mypy.types import names
 
 from samosa.utils import AliasedGroup, invoked
 
+# Accepts git@github.com:user/repo(.git) and https://github.com/user/repo(.git)(/)
+_GITHUB_PREFIXES = ("git@github.com:", "https://github.com/")
+
+# Backup branch suffix, e.g. backup/main-21-36-47_08-08-2025
+_TIMESTAMP_FORMAT = "%H-%M-%S_%d-%m-%Y"
+
+# Default branch names tried by sync when the remote HEAD is unknown
+_MAIN_BRANCH_CANDIDATES = ("main", "master", "develop")
+
+
+def _parse_github_url(remote_url):
+    """Return ``(user, repo)`` for a GitHub remote URL, or ``None``."""
+    for prefix in _GITHUB_PREFIXES:
+        if remote_url.startswith(prefix):
+            path = remote_url[len(prefix) :].rstrip("/")
+            if path.endswith(".git"):
+                path = path[: -len(".git")]
+            user, _, repo = path.partition("/")
+            if user and repo and "/" not in repo:
+                return user, repo
+            return None
+    return None
+
+
+def _git(*args, check=False):
+    """Run a read-only git command without a shell and capture its output."""
+    return subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        check=check,
+    )
+
+
+def _git_start(*args):
+    """Start a read-only git command in the background; collect with communicate()."""
+    return subprocess.Popen(
+        ["git", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
+def _git_dir():
+    """Return the git directory for the cwd, following worktree ``.git`` files."""
+    return _find_git_dir(Path.cwd())
+
+
+# cwd -> git directory; only hits are stored, so a repo created later is found
+_git_dirs = {}
+
+
+def _find_git_dir(cwd):
+    """Walk up from ``cwd`` to its git directory; found directories are cached."""
+    git_dir = _git_dirs.get(cwd)
+    if git_dir is None:
+        git_dir = _walk_to_git_dir(cwd)
+        if git_dir is not None:
+            _git_dirs[cwd] = git_dir
+    return git_dir
+
+
+def _walk_to_git_dir(cwd):
+    """Return the git directory above ``cwd``, or ``None`` outside a repository."""
+    for parent in [cwd, *cwd.parents]:
+        dot_git = parent / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            # Linked worktrees: .git is a file containing "gitdir: <path>"
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir:"):
+                return (parent / content[len("gitdir:") :].strip()).resolve()
+            return None
+    return None
+
+
+@lru_cache(maxsize=None)
+def _common_git_dir(git_dir):
+    """Return the shared git directory holding refs for ``git_dir``."""
+    commondir = git_dir / "commondir"
+    if commondir.is_file():
+        return (git_dir / commondir.read_text().strip()).resolve()
+    return git_dir
+
+
+def _has_local_branch(branch):
+    """Return whether ``refs/heads/<branch>`` exists, using a stat before git."""
+    git_dir = _git_dir()
+    common_dir = _common_git_dir(git_dir) if git_dir else None
+    if common_dir is None or (common_dir / "reftable").is_dir():
+        result = _git("show-ref", "--verify", "--quiet", f"refs/heads/{branch}")
+        return result.returncode == 0
+
+    ref = f"refs/heads/{branch}"
+    if (common_dir / ref).is_file():
+        return True
+
+    # Packed refs: "<sha> <refname>" lines, peeled tags start with "^"
+    packed_refs = common_dir / "packed-refs"
+    if packed_refs.is_file():
+        with open(packed_refs) as f:
+            for line in f:
+                if line.rstrip("\n").partition(" ")[2] == ref:
+                    return True
+    return False
+
+
+def _backup_branches(current_branch, include_remote=False):
+    """Return sorted backup branch names for ``current_branch``.
+
+    Git filters refs by prefix, so only matching names are ever read back.
+    Every returned name starts with ``backup/``.
+    """
+    ref_prefixes = ["refs/heads/"]
+    if include_remote:
+        ref_prefixes.append("refs/remotes/origin/")
+    backup_prefix = f"backup/{current_branch}-"
+
+    result = _git(
+        "for-each-ref",
+        "--format=%(refname)",
+        *(f"{p}{backup_prefix}*" for p in ref_prefixes),
+        check=True,
+    )
+    backups = set()
+    for ref in result.stdout.splitlines():
+        for prefix in ref_prefixes:
+            if ref.startswith(prefix):
+                backups.add(ref[len(prefix) :])
+                break
+    return sorted(backups)
+
+
+def _parse_ls_remote(output):
+    """Return the set of ref names in ``git ls-remote`` output."""
+    return frozenset(
+        line.partition("\t")[2] for line in output.splitlines() if "\t" in line
+    )
+
+
+def _worktree_path(branch):
+    """Return the worktree path for ``branch``: ``../<project>-<branch>``.
+
+    Slashes become dashes, so ``feat/some-feature`` maps to
+    ``../<project>-feat-some-feature``.
+    """
+    cwd = Path.cwd()
+    return cwd.parent / f"{cwd.name}-{branch.replace('/', '-')}"
+
+
+def _worktrees():
+    """Return registered worktrees as ``{path: attributes}`` from one porcelain call.
+
+    Attributes are the porcelain keys of each block, e.g. ``HEAD`` and
+    ``branch`` (``refs/heads/<name>``); flags such as ``detached`` map to "".
+    Raises ``click.ClickException`` with git's message if the listing fails.
+    """
+    result = _git("worktree", "list", "--porcelain")
+    if result.returncode != 0:
+        raise click.ClickException(result.stderr.strip() or "git worktree list failed")
+    worktrees = {}
+    attrs = None
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            attrs = worktrees[value] = {}
+        elif line and attrs is not None:
+            attrs[key] = value
+    return worktrees
+
+
+def _path_key(path):
+    """Normalize a path so git's porcelain spelling and ``Path`` compare equal."""
+    return os.path.normcase(str(Path(path).resolve()))
+
+
+def _is_registered_worktree(path):
+    """Return True if git has a worktree registered at ``path``."""
+    key = _path_key(path)
+    return any(_path_key(registered) == key for registered in _worktrees())
+
+
+def _current_branch(c):
+    """Return the checked-out branch name, read from HEAD and cached on ``c``."""
+    current_branch = getattr(c, "_samosa_current_branch", None)
+    if current_branch is not None:
+        return current_branch
+
+    git_dir = _git_dir()
+    if git_dir is None:
+        current_branch = _git("branch", "--show-current", check=True).stdout.strip()
+    else:
+        # Detached HEAD holds a commit hash, which maps to "" like git does
+        head = (git_dir / "HEAD").read_text().strip()
+        prefix = "ref: refs/heads/"
+        current_branch = head[len(prefix) :] if head.startswith(prefix) else ""
+
+    c._samosa_current_branch = current_branch
+    return current_branch
+
 
 @click.group(cls=AliasedGroup)
 def git():
@@ -89,8 +295,7 @@ def sync(c, _, remote, main_branch):
     """Sync current branch with remote main."""
 
     try:
-        result = c.run("git branch --show-current", hide=True)
-        current_branch = result.stdout.strip()
+        current_branch = _current_branch(c)
 
         if not current_branch:
             click.echo("❌ Could not determine current branch", err=True)
@@ -98,23 +303,32 @@ def sync(c, _, remote, main_branch):
 
         if not main_branch or main_branch.strip() == "":
             try:
-                # Try to get the default branch from remote HEAD
-                result = c.run(
-                    f"git symbolic-ref refs/remotes/{remote}/HEAD", hide=True, warn=True
-                )
-                if result.ok:
-                    main_branch = result.stdout.strip().split("/")[-1]
+                # Try the locally cached remote HEAD first, no network needed
+                result = _git("symbolic-ref", f"refs/remotes/{remote}/HEAD")
+                if result.returncode == 0:
+                    main_branch = result.stdout.strip().rpartition("/")[2]
                 else:
-                    # Fallback: try common main branch names
-                    for branch in ["main", "master", "develop"]:
-                        result = c.run(
-                            f"git ls-remote --heads {remote} {branch}",
-                            hide=True,
-                            warn=True,
-                        )
-                        if result.ok and result.stdout.strip():
-                            main_branch = branch
+                    # Fallback: one ls-remote for HEAD's symref and common names
+                    result = _git(
+                        "ls-remote",
+                        "--symref",
+                        remote,
+                        "HEAD",
+                        *(f"refs/heads/{b}" for b in _MAIN_BRANCH_CANDIDATES),
+                    )
+                    heads = set()
+                    for line in result.stdout.splitlines():
+                        ref, _, name = line.partition("\t")
+                        if ref.startswith("ref: ") and name == "HEAD":
+                            # "ref: refs/heads/<name>\tHEAD"
+                            main_branch = ref[len("ref: refs/heads/") :]
                             break
+                        heads.add(name.partition("refs/heads/")[2])
+                    else:
+                        for branch in _MAIN_BRANCH_CANDIDATES:
+                            if branch in heads:
+                                main_branch = branch
+                                break
 
                     if not main_branch:
                         main_branch = "main"
@@ -147,9 +361,6 @@ def sync(c, _, remote, main_branch):
 @invoked
 def browse(c):
     """Open current git repository in GitHub in the browser."""
-    import re
-    import webbrowser
-
     try:
         # Get the remote URL
         result = c.run("git remote get-url origin", hide=True)
@@ -163,28 +374,9 @@ def browse(c):
 
         # Convert various Git URL formats to GitHub web URL
         github_url = None
-
-        # Handle SSH format: git@github.com:user/repo.git
-        ssh_match = re.match(r"git@github\.com:([^/]+)/(.+)\.git$", remote_url)
-        if ssh_match:
-            user, repo = ssh_match.groups()
-            github_url = f"https://github.com/{user}/{repo}"
-
-        # Handle HTTPS format: https://github.com/user/repo.git
-        elif re.match(r"https://github\.com/([^/]+)/(.+?)\.git$", remote_url):
-            https_match = re.match(
-                r"https://github\.com/([^/]+)/(.+?)\.git$", remote_url
-            )
-            user, repo = https_match.groups()
-            github_url = f"https://github.com/{user}/{repo}"
-
-        # Handle HTTPS without .git: https://github.com/user/repo
-        elif re.match(r"https://github\.com/([^/]+)/([^/]+)/?$", remote_url):
-            https_no_git_match = re.match(
-                r"https://github\.com/([^/]+)/([^/]+)/?$", remote_url
-            )
-            user, repo = https_no_git_match.groups()
-            github_url = f"https://github.com/{user}/{repo}"
+        parsed = _parse_github_url(remote_url)
+        if parsed:
+            github_url = "https://github.com/{}/{}".format(*parsed)
 
         if github_url:
             click.echo(f"🌐 Opening: {github_url}")
@@ -216,23 +408,21 @@ git.add_command_with_aliases(backup, name="backup", aliases=["b"])
 
 
 @backup.command("add")
+@click.option("-y", "--yes", is_flag=True, help="Skip the confirmation prompt")
 @invoked
-def backup_add(c):
+def backup_add(c, _, yes):
     """Create a backup branch from the current branch."""
     try:
-        # Get current branch name
-        result = c.run("git branch --show-current", hide=True)
-        current_branch = result.stdout.strip()
+        current_branch = _current_branch(c)
 
         if not current_branch:
             click.echo("❌ Could not determine current branch", err=True)
             return
 
-        now = datetime.now()
-        timestamp = now.strftime("%H-%M-%S_%d-%m-%Y")
+        timestamp = time.strftime(_TIMESTAMP_FORMAT)
         backup_branch = f"backup/{current_branch}-{timestamp}"
 
-        if click.confirm("❓ Create backup branch?"):
+        if yes or click.confirm("❓ Create backup branch?"):
             click.echo(f"💾 Creating backup branch: {backup_branch}")
             c.run(f"git branch {backup_branch}")
             click.echo(f"✅ Backup branch '{backup_branch}' created successfully!")
@@ -251,9 +441,7 @@ def backup_list(c):
     """List all backup branches for the current branch."""
 
     try:
-        # Get current branch name
-        result = c.run("git branch --show-current", hide=True)
-        current_branch = result.stdout.strip()
+        current_branch = _current_branch(c)
 
         if not current_branch:
             click.echo("❌ Could not determine current branch", err=True)
@@ -261,21 +449,10 @@ def backup_list(c):
 
         click.echo(f"🔍 Backup branches for '{current_branch}':")
 
-        # Get all branches and filter for backups of current branch
-        result = c.run("git branch -a", hide=True)
-        branches = result.stdout.strip().split("\n")
-
-        backup_pattern = f"backup/{current_branch}-"
-        backups = []
-
-        for branch in branches:
-            # Clean up branch name (remove * and whitespace)
-            clean_branch = branch.strip().lstrip("* ").replace("remotes/origin/", "")
-            if backup_pattern in clean_branch:
-                backups.append(clean_branch)
+        backups = _backup_branches(current_branch, include_remote=True)
 
         if backups:
-            for backup in sorted(backups):
+            for backup in backups:
                 click.echo(f"  📦 {backup}")
             click.echo(f"\n✅ Found {len(backups)} backup(s)")
         else:
@@ -297,16 +474,26 @@ def backup_list(c):
 @click.option(
     "--branch", help="Delete specific backup branch by name (without backup/ prefix)"
 )
+@click.option("-y", "--yes", is_flag=True, help="Skip the confirmation prompt")
 @invoked
-def backup_delete(c, _, delete_all, branch):
+def backup_delete(c, _, delete_all, branch, yes):
     """Delete backup branches for the current branch."""
     try:
-        # Get current branch name
-        result = c.run("git branch --show-current", hide=True)
-        current_branch = result.stdout.strip()
-
-        if not current_branch:
-            click.echo("❌ Could not determine current branch", err=True)
+        if not branch and not delete_all:
+            # No options provided, show help before touching the repository
+            click.echo(
+                "❌ Please specify either --all to delete all backups or --branch to delete a specific backup",
+                err=True,
+            )
+            click.echo("💡 Usage:", err=True)
+            click.echo("   samosa git backup delete --all", err=True)
+            click.echo(
+                "   samosa git backup delete --branch main-21-36-47_08-08-2025",
+                err=True,
+            )
+            click.echo(
+                "   samosa git backup list  # to see available backups", err=True
+            )
             return
 
         if branch:
@@ -336,18 +523,7 @@ def backup_delete(c, _, delete_all, branch):
             else:
                 backup_branch = branch
 
-            # Check if branch exists
-            result = c.run("git branch", hide=True)
-            branches = result.stdout.strip().split("\n")
-
-            branch_exists = False
-            for b in branches:
-                clean_branch = b.strip().lstrip("* ")
-                if clean_branch == backup_branch:
-                    branch_exists = True
-                    break
-
-            if not branch_exists:
+            if not _has_local_branch(backup_branch):
                 click.echo(f"❌ Backup branch '{backup_branch}' not found", err=True)
                 click.echo(
                     "💡 Use 'samosa git backup list' to see available backups", err=True
@@ -361,7 +537,7 @@ def backup_delete(c, _, delete_all, branch):
                 f"\n\033[91m⚠️  WARNING: This will permanently delete backup branch '{backup_branch}'!\033[0m",
                 err=True,
             )
-            if click.confirm(
+            if yes or click.confirm(
                 "\033[91m❓ Are you sure you want to delete this backup branch?\033[0m"
             ):
                 try:
@@ -382,25 +558,17 @@ def backup_delete(c, _, delete_all, branch):
             else:
                 click.echo("❌ Backup deletion cancelled")
 
-        elif delete_all:
+        else:
             # Delete all backup branches for current branch
-            click.echo(f"🗑️  Deleting all backup branches for '{current_branch}'...")
+            current_branch = _current_branch(c)
 
-            # Get all local branches and filter for backups of current branch
-            result = c.run("git branch", hide=True)
-            branches = result.stdout.strip().split("\n")
+            if not current_branch:
+                click.echo("❌ Could not determine current branch", err=True)
+                return
 
-            backup_pattern = f"backup/{current_branch}-"
-            local_backups = []
+            click.echo(f"🗑️  Deleting all backup branches for '{current_branch}'...")
 
-            for b in branches:
-                # Clean up branch name (remove * and whitespace)
-                clean_branch = b.strip().lstrip("* ")
-                # Failsafe: double-check that this is actually a backup branch
-                if backup_pattern in clean_branch and clean_branch.startswith(
-                    "backup/"
-                ):
-                    local_backups.append(clean_branch)
+            local_backups = _backup_branches(current_branch)
 
             if not local_backups:
                 click.echo(
@@ -409,7 +577,7 @@ def backup_delete(c, _, delete_all, branch):
                 return
 
             click.echo(f"📋 Found {len(local_backups)} backup branch(es) to delete:")
-            for backup in sorted(local_backups):
+            for backup in local_backups:
                 click.echo(f"  📦 {backup}")
 
             # Ask for confirmation with red warning
@@ -417,25 +585,38 @@ def backup_delete(c, _, delete_all, branch):
                 f"\n\033[91m⚠️  WARNING: This will permanently delete {len(local_backups)} backup branch(es)!\033[0m",
                 err=True,
             )
-            if click.confirm(
+            if yes or click.confirm(
                 "\033[91m❓ Are you sure you want to delete all backup branches?\033[0m"
             ):
-                deleted_count = 0
+                # Final safety check before deletion
                 for backup in local_backups:
-                    try:
-                        # Final safety check before deletion
-                        if not backup.startswith("backup/"):
-                            click.echo(
-                                f"  ❌ SAFETY ABORT: Skipping non-backup branch '{backup}'",
-                                err=True,
-                            )
-                            continue
-
-                        c.run(f"git branch -D {backup}")
+                    if not backup.startswith("backup/"):
+                        click.echo(
+                            f"  ❌ SAFETY ABORT: Skipping non-backup branch '{backup}'",
+                            err=True,
+                        )
+                to_delete = [b for b in local_backups if b.startswith("backup/")]
+
+                # One git process for all branches; LC_ALL=C keeps output parseable
+                result = c.run(
+                    "git branch -D " + " ".join(shlex.quote(b) for b in to_delete),
+                    hide=True,
+                    warn=True,
+                    env={"LC_ALL": "C"},
+                )
+                deleted = {
+                    line[len("Deleted branch ") :].rsplit(" (was ", 1)[0]
+                    for line in result.stdout.splitlines()
+                    if line.startswith("Deleted branch ")
+                }
+                for backup in to_delete:
+                    if backup in deleted:
                         click.echo(f"  🗑️  Deleted: {backup}")
-                        deleted_count += 1
-                    except Exception as e:
-                        click.echo(f"  ❌ Failed to delete {backup}: {e}", err=True)
+                    else:
+                        click.echo(f"  ❌ Failed to delete {backup}", err=True)
+                for line in result.stderr.splitlines():
+                    click.echo(f"  {line}", err=True)
+                deleted_count = len(deleted)
 
                 if deleted_count > 0:
                     click.echo(
@@ -445,21 +626,6 @@ def backup_delete(c, _, delete_all, branch):
                     click.echo("❌ No backup branches were deleted")
             else:
                 click.echo("❌ Backup deletion cancelled")
-        else:
-            # No options provided, show help
-            click.echo(
-                "❌ Please specify either --all to delete all backups or --branch to delete a specific backup",
-                err=True,
-            )
-            click.echo("💡 Usage:", err=True)
-            click.echo("   samosa git backup delete --all", err=True)
-            click.echo(
-                "   samosa git backup delete --branch main-21-36-47_08-08-2025",
-                err=True,
-            )
-            click.echo(
-                "   samosa git backup list  # to see available backups", err=True
-            )
 
     except Exception as e:
         click.echo(f"❌ Error deleting backup branches: {e}", err=True)
@@ -487,78 +653,108 @@ git.add_command_with_aliases(worktree, name="worktree", aliases=["w"])
 @click.option(
     "--fetch/--no-fetch",
     default=True,
-    help="Fetch latest remote changes before creating worktree (default: True)",
+    help="Query the remote for the branch before creating worktree (default: True)",
 )
 @invoked
 def worktree_add(c, _, branch, base, fetch):
     """Create a git worktree one directory up with project-name-branch format."""
-    current_dir = Path.cwd()
-    project_name = current_dir.name
+    worktree_path = _worktree_path(branch)
+    quoted_path = shlex.quote(str(worktree_path))
 
-    # Convert branch name to directory-safe format
-    # feat/some-feature -> feat-some-feature
-    safe_branch = branch.replace("/", "-")
-
-    # Create worktree directory name: project-name-branch
-    worktree_name = f"{project_name}-{safe_branch}"
-
-    # Path to create worktree (one directory up)
-    worktree_path = current_dir.parent / worktree_name
+    if worktree_path.exists():
+        click.echo(f"📁 Worktree already exists at {worktree_path}")
+        return
 
     click.echo(f"Creating worktree for branch '{branch}' at: {worktree_path}")
 
     try:
-        # Fetch latest changes if requested
-        if fetch:
-            click.echo("🔄 Fetching latest changes...")
-            c.run("git fetch --all", warn=True)
-
         # Check if branch exists locally
-        local_result = c.run("git branch --list", hide=True, warn=True)
-        local_branches = local_result.stdout if local_result.ok else ""
+        branch_exists_locally = _has_local_branch(branch)
 
-        # Check if branch exists remotely
-        remote_result = c.run("git branch -r", hide=True, warn=True)
-        remote_branches = remote_result.stdout if remote_result.ok else ""
+        # Ask the remote for this one ref instead of fetching everything; the
+        # network round trip overlaps with the worktree registry check below
+        remote_query = None
+        if not branch_exists_locally and fetch:
+            click.echo("🔄 Checking remote for branch...")
+            remote_query = _git_start("ls-remote", "--heads", "origin", branch)
 
-        branch_exists_locally = (
-            f" {branch}\n" in local_branches or f"* {branch}\n" in local_branches
-        )
-        branch_exists_remotely = f"origin/{branch}" in remote_branches
+        try:
+            # A registered path whose directory was deleted by hand blocks worktree add
+            if _is_registered_worktree(worktree_path):
+                click.echo("🧹 Pruning stale worktree registration...")
+                c.run("git worktree prune")
+
+            # Check if branch exists remotely
+            branch_exists_remotely = False
+            if not branch_exists_locally:
+                queried = False
+                if remote_query is not None:
+                    remote_stdout, remote_stderr = remote_query.communicate()
+                    queried = remote_query.returncode == 0
+                    if not queried:
+                        reason = remote_stderr.strip().splitlines()
+                        click.echo(
+                            "⚠️  Could not query origin"
+                            + (f" ({reason[-1]})" if reason else "")
+                            + "; falling back to local remote-tracking refs"
+                        )
+                if queried:
+                    # ls-remote matches patterns by path tail, so "x" also lists
+                    # refs/heads/feat/x; compare full ref names instead
+                    branch_exists_remotely = f"refs/heads/{branch}" in _parse_ls_remote(
+                        remote_stdout
+                    )
+                    if branch_exists_remotely:
+                        click.echo(f"🔄 Fetching origin/{branch}...")
+                        c.run(f"git fetch origin {branch}")
+                else:
+                    remote_result = _git(
+                        "show-ref",
+                        "--verify",
+                        "--quiet",
+                        f"refs/remotes/origin/{branch}",
+                    )
+                    branch_exists_remotely = remote_result.returncode == 0
+        finally:
+            # Never leave the background ls-remote running or unreaped
+            if remote_query is not None and remote_query.returncode is None:
+                remote_query.kill()
+                remote_query.communicate()
 
         if branch_exists_locally:
             click.echo(f"📍 Branch '{branch}' exists locally, creating worktree...")
-            c.run(f"git worktree add {worktree_path} {branch}")
+            c.run(f"git worktree add {quoted_path} {branch}")
 
         elif branch_exists_remotely:
             click.echo(
                 f"🌐 Branch '{branch}' exists on remote, creating tracking worktree..."
             )
             # Create worktree and set up proper tracking
-            c.run(f"git worktree add -b {branch} {worktree_path} origin/{branch}")
+            c.run(f"git worktree add -b {branch} {quoted_path} origin/{branch}")
 
         else:
             # Create new branch
             if base and base.strip():
                 click.echo(f"🆕 Creating new branch '{branch}' from '{base}'...")
-                c.run(f"git worktree add -b {branch} {worktree_path} {base}")
+                c.run(f"git worktree add -b {branch} {quoted_path} {base}")
             else:
                 click.echo(f"🆕 Creating new branch '{branch}' from current HEAD...")
-                c.run(f"git worktree add -b {branch} {worktree_path}")
+                c.run(f"git worktree add -b {branch} {quoted_path}")
 
         click.echo("✅ Worktree created successfully!")
         click.echo(f"📁 Location: {worktree_path}")
         click.echo(f"🔄 To switch: cd {worktree_path}")
 
         # Show branch tracking info
-        try:
-            tracking_info = c.run(
-                f"cd {worktree_path} && git branch -vv | head -1", hide=True, warn=True
-            )
-            if tracking_info.ok:
-                click.echo(f"🔗 Branch info: {tracking_info.stdout.strip()}")
-        except Exception:
-            pass
+        upstream = _git(
+            "-C",
+            str(worktree_path),
+            "rev-parse",
+            "--abbrev-ref",
+            f"{branch}@{{upstream}}",
+        )
+        if upstream.returncode == 0:
+            click.echo(f"🔗 Tracking: {upstream.stdout.strip()}")
 
     except Exception as e:
         click.echo(f"❌ Error creating worktree: {e}", err=True)
@@ -583,29 +779,28 @@ def worktree_add(c, _, branch, base, fetch):
 @invoked
 def worktree_remove(c, _, branch):
     """Remove a git worktree by branch name."""
-    # Get the current project directory name
-    current_dir = Path.cwd()
-    project_name = current_dir.name
-
-    # Convert branch name to directory-safe format
-    safe_branch = branch.replace("/", "-")
-
-    # Create worktree directory name: project-name-branch
-    worktree_name = f"{project_name}-{safe_branch}"
-
-    # Path to worktree (one directory up)
-    worktree_path = current_dir.parent / worktree_name
+    worktree_path = _worktree_path(branch)
+    quoted_path = shlex.quote(str(worktree_path))
 
     click.echo(f"Removing worktree for branch '{branch}' at: {worktree_path}")
 
-    try:
-        # Check if worktree exists
-        if not worktree_path.exists():
-            click.echo(f"❌ Worktree directory not found: {worktree_path}", err=True)
+    # Check if worktree exists
+    registered = _is_registered_worktree(worktree_path)
+    if not worktree_path.exists():
+        if registered:
+            # Directory deleted by hand: only git's bookkeeping is left
+            c.run("git worktree prune")
+            click.echo("✅ Pruned stale worktree registration")
             return
+        click.echo(f"❌ Worktree directory not found: {worktree_path}", err=True)
+        return
+    if not registered:
+        click.echo(f"❌ Not a registered git worktree: {worktree_path}", err=True)
+        return
 
+    try:
         # Remove the worktree
-        c.run(f"git worktree remove {worktree_path}")
+        c.run(f"git worktree remove {quoted_path}")
 
         click.echo("✅ Worktree removed successfully!")
         click.echo(f"🗑️  Removed: {worktree_path}")
@@ -615,7 +810,7 @@ def worktree_remove(c, _, branch):
         # Try force remove if normal remove fails
         try:
             click.echo("🔄 Attempting force removal...")
-            c.run(f"git worktree remove --force {worktree_path}")
+            c.run(f"git worktree remove --force {quoted_path}")
             click.echo("✅ Worktree force removed successfully!")
         except Exception as fe:
             click.echo(f"❌ Force removal also failed: {fe}", err=True)
@@ -626,5 +821,14 @@ def worktree_remove(c, _, branch):
 @invoked
 def worktree_list(c):
     """List all git worktrees."""
+    worktrees = _worktrees()
     click.echo("📂 Git Worktrees:")
-    c.run("git worktree list")
+    for path, attrs in worktrees.items():
+        if "branch" in attrs:
+            ref = attrs["branch"]
+            label = ref[len("refs/heads/") :] if ref.startswith("refs/heads/") else ref
+        elif "bare" in attrs:
+            label = "bare"
+        else:
+            label = f"detached at {attrs.get('HEAD', '')[:7]}"
+        click.echo(f"  📁 {path} [{label}]")
@@ -1,29 +1,104 @@
 """Utility and helper commands."""
 
+from functools import lru_cache
+import mmap
 import os
 from pathlib import Path
+import re
 import shutil
-import subprocess
+import sys
+import tempfile
 
 import click
 from invoke import Context
 
+# Shell startup files that carry the alias
+_SHELL_CONFIG_FILES = {
+    "bash": ("~/.bashrc", "~/.bash_profile"),
+    "zsh": ("~/.zshrc",),
+    "fish": ("~/.config/fish/config.fish",),
+}
+
+# The marker comment and any "alias s=..."/"alias s ..." line pointing at samosa
+_ALIAS_LINE_RE = re.compile(
+    r"^[ \t]*(?:# Samosa CLI alias[ \t]*|.*alias s[= ].*samosa.*)(?:\n|$)",
+    re.MULTILINE,
+)
+
+
+def _find_any(f, *needles):
+    """Return whether any of ``needles`` occurs in the binary file object ``f``."""
+    if os.fstat(f.fileno()).st_size == 0:
+        # mmap cannot map an empty file
+        return False
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return any(mm.find(needle) != -1 for needle in needles)
+
+
+def _contains(path, *needles):
+    """Return whether the file at ``path`` contains any of ``needles`` (bytes)."""
+    try:
+        with open(path, "rb") as f:
+            return _find_any(f, *needles)
+    except (FileNotFoundError, IsADirectoryError):
+        return False
+
+
+def _replace_text(path, text):
+    """Atomically replace the contents of ``path`` with ``text``, keeping its mode.
+
+    Symlinks are followed so that dotfiles managed as links stay links.
+    """
+    path = Path(path).resolve()
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        shutil.copymode(str(path), tmp_name)
+        os.replace(tmp_name, str(path))
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+# Standalone completion script per shell; bash uses it only as a fallback
+_COMPLETION_FILES = {
+    "bash": "~/.local/share/bash-completion/completions/samosa",
+    "zsh": "~/.zsh/completions/_samosa",
+    "fish": "~/.config/fish/completions/samosa.fish",
+}
+
+# ~/.bash_completion section: marker, Click's script, end marker. Sections
+# written before the end marker existed stop at the first blank line.
+_COMPLETION_MARKER = "# Samosa completion"
+_COMPLETION_END_MARKER = "# Samosa completion end"
+_COMPLETION_BLOCK_RE = re.compile(
+    r"\n?^# Samosa completion\n(?:.*\n)*?# Samosa completion end[ \t]*(?:\n|$)"
+    r"|^# Samosa completion\n(?:.+\n)*(?:\n|.+$)?",
+    re.MULTILINE,
+)
+
 
+@lru_cache(maxsize=1)
 def get_project_config():
-    """Read project configuration from package metadata or pyproject.toml."""
+    """Read project configuration from package metadata or pyproject.toml.
+
+    The result is cached for the life of the process; treat it as read-only.
+    """
     config = {
         "name": "samosa",
         "version": "unknown",
         "description": "A Python CLI tool for task automation and project management",
     }
 
+    try:
+        from importlib.metadata import PackageNotFoundError, metadata, version
+    except ImportError:
+        # Python < 3.8 fallback
+        from importlib_metadata import PackageNotFoundError, metadata, version
+
     try:
         # First try to get info from installed package metadata
-        try:
-            from importlib.metadata import metadata, version
-        except ImportError:
-            # Python < 3.8 fallback
-            from importlib_metadata import metadata, version
         meta = metadata("samosa")
         config.update(
             {
@@ -33,7 +108,7 @@ def get_project_config():
             }
         )
         return config
-    except Exception:
+    except PackageNotFoundError:
         pass
 
     try:
@@ -50,24 +125,75 @@ def get_project_config():
             pyproject_path = Path.cwd() / "pyproject.toml"
 
         if pyproject_path.exists():
-            with open(pyproject_path, "rb") as f:
-                toml_config = tomllib.load(f)
-                project_config = toml_config.get("project", {})
-                config.update(
-                    {
-                        "name": project_config.get("name", config["name"]),
-                        "version": project_config.get("version", config["version"]),
-                        "description": project_config.get(
-                            "description", config["description"]
-                        ),
-                    }
-                )
+            toml_config = tomllib.loads(pyproject_path.read_text(encoding="utf-8"))
+            project_config = toml_config.get("project", {})
+            config.update(
+                {
+                    "name": project_config.get("name", config["name"]),
+                    "version": project_config.get("version", config["version"]),
+                    "description": project_config.get(
+                        "description", config["description"]
+                    ),
+                }
+            )
     except Exception:
         pass
 
     return config
 
 
+@lru_cache(maxsize=1)
+def _detect_shell():
+    """Return the user's shell (zsh, bash or fish) from $SHELL, or None."""
+    shell_path = os.environ.get("SHELL", "").lower()
+    for shell in ("zsh", "bash", "fish"):
+        if shell in shell_path:
+            return shell
+    return None
+
+
+@lru_cache(maxsize=1)
+def _find_samosa():
+    """Return the path of the samosa executable on PATH, or None.
+
+    When running from the installed entry point, ``sys.argv[0]`` already is
+    that path; it is only trusted if its directory is on PATH, since the
+    alias and completion scripts call plain ``samosa`` from new shells.
+    """
+    argv0 = Path(sys.argv[0])
+    if argv0.is_absolute() and argv0.stem == "samosa" and argv0.is_file():
+        parent = os.path.normcase(str(argv0.parent))
+        path_dirs = os.environ.get("PATH", "").split(os.pathsep)
+        if any(os.path.normcase(os.path.abspath(d)) == parent for d in path_dirs if d):
+            return str(argv0)
+    return shutil.which("samosa")
+
+
+def _completion_script(shell):
+    """Return Click's completion script for ``shell``, generated in-process."""
+    from click.shell_completion import get_completion_class
+
+    from samosa.cli import main
+
+    comp_cls = get_completion_class(shell)
+    return comp_cls(main, {}, "samosa", "_SAMOSA_COMPLETE").source()
+
+
+def _write_completion_file(comp_file, completion_script):
+    """Write ``completion_script`` to ``comp_file``, creating its directory."""
+    comp_file.parent.mkdir(parents=True, exist_ok=True)
+    comp_file.write_text(completion_script)
+    click.echo(f"✅ Installed completion to {comp_file}")
+
+
+@lru_cache(maxsize=1)
+def _platform_str():
+    """Return ``platform.platform()``, computed once per process."""
+    import platform
+
+    return platform.platform()
+
+
 @click.group()
 def utils():
     """Utility and helper commands."""
@@ -85,13 +211,10 @@ def info():
 @utils.command()
 def env():
     """Show environment information."""
-    import platform
-    import sys
-
     ctx = Context()
 
     click.echo(f"Python version: {sys.version}")
-    click.echo(f"Platform: {platform.platform()}")
+    click.echo(f"Platform: {_platform_str()}")
     click.echo(f"Working directory: {ctx.cwd}")
 
 
@@ -108,14 +231,8 @@ def install_alias(shell):
 
     # Detect shell if auto
     if shell == "auto":
-        shell_path = os.environ.get("SHELL", "").lower()
-        if "zsh" in shell_path:
-            shell = "zsh"
-        elif "bash" in shell_path:
-            shell = "bash"
-        elif "fish" in shell_path:
-            shell = "fish"
-        else:
+        shell = _detect_shell()
+        if shell is None:
             click.echo(
                 "⚠️  Could not auto-detect shell. Please specify: --shell bash|zsh|fish",
                 err=True,
@@ -123,7 +240,7 @@ def install_alias(shell):
             return
 
     # Check if samosa is available
-    samosa_path = shutil.which("samosa")
+    samosa_path = _find_samosa()
     if not samosa_path:
         click.echo("❌ samosa command not found in PATH", err=True)
         click.echo("💡 Make sure samosa is installed globally first")
@@ -156,40 +273,25 @@ def install_alias(shell):
     # Define alias
     alias_line = 'alias s="samosa"'
 
-    # Shell-specific configuration
-    config_files = {
-        "bash": ["~/.bashrc", "~/.bash_profile"],
-        "zsh": ["~/.zshrc"],
-        "fish": ["~/.config/fish/config.fish"],
-    }
-
     if shell == "fish":
         alias_line = "alias s samosa"
 
     success = False
-    for config_file in config_files.get(shell, []):
+    for config_file in _SHELL_CONFIG_FILES.get(shell, ()):
         config_path = Path(config_file).expanduser()
 
         # Create config directory if needed (especially for fish)
         config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Check if alias already exists
-        alias_exists = False
-        if config_path.exists():
-            with open(config_path) as f:
-                content = f.read()
-                if "alias s=" in content or "alias s " in content:
-                    alias_exists = True
-
-        if alias_exists:
-            click.echo(f"✅ Alias 's' already exists in {config_path}")
-            success = True
-            continue
-
         try:
-            # Add alias to config file
-            with open(config_path, "a") as f:
-                f.write(f"\n# Samosa CLI alias\n{alias_line}\n")
+            # One open both checks for an existing alias and appends ours
+            with open(config_path, "ab+") as f:
+                if _find_any(f, b"alias s=", b"alias s "):
+                    click.echo(f"✅ Alias 's' already exists in {config_path}")
+                    success = True
+                    continue
+
+                f.write(f"\n# Samosa CLI alias\n{alias_line}\n".encode())
 
             click.echo(f"✅ Added alias to {config_path}")
             success = True
@@ -232,14 +334,8 @@ def uninstall_alias(shell):
     """Remove shell alias 's' for samosa command."""
     # Detect shell if auto
     if shell == "auto":
-        shell_path = os.environ.get("SHELL", "").lower()
-        if "zsh" in shell_path:
-            shell = "zsh"
-        elif "bash" in shell_path:
-            shell = "bash"
-        elif "fish" in shell_path:
-            shell = "fish"
-        else:
+        shell = _detect_shell()
+        if shell is None:
             click.echo(
                 "⚠️  Could not auto-detect shell. Please specify: --shell bash|zsh|fish",
                 err=True,
@@ -248,51 +344,23 @@ def uninstall_alias(shell):
 
     click.echo(f"🐚 Removing samosa alias from {shell} shell...")
 
-    # Shell-specific configuration files
-    config_files = {
-        "bash": ["~/.bashrc", "~/.bash_profile"],
-        "zsh": ["~/.zshrc"],
-        "fish": ["~/.config/fish/config.fish"],
-    }
-
     success = False
-    for config_file in config_files.get(shell, []):
+    for config_file in _SHELL_CONFIG_FILES.get(shell, ()):
         config_path = Path(config_file).expanduser()
 
-        if not config_path.exists():
+        if not _contains(config_path, b"alias s", b"# Samosa CLI alias"):
+            if config_path.exists():
+                click.echo(f"i  No alias found in {config_path}")
             continue
 
         try:
-            # Read current content
-            with open(config_path) as f:
-                lines = f.readlines()
-
-            # Filter out samosa alias lines
-            new_lines = []
-            skip_next = False
-
-            for line in lines:
-                if skip_next:
-                    skip_next = False
-                    continue
-
-                # Skip samosa alias comment
-                if line.strip() == "# Samosa CLI alias":
-                    skip_next = True  # Skip the next line (the actual alias)
-                    continue
-
-                # Skip direct alias lines
-                if ("alias s=" in line and "samosa" in line) or (
-                    "alias s " in line and "samosa" in line
-                ):
-                    continue
-
-                new_lines.append(line)
+            # Drop the marker comment and samosa alias lines in one pass
+            content = config_path.read_text()
+            new_content, removed = _ALIAS_LINE_RE.subn("", content)
 
             # Write back if changed
-            if len(new_lines) != len(lines):
-                with open(config_path, "w") as f:
-                    f.writelines(new_lines)
+            if removed:
+                _replace_text(config_path, new_content)
                 click.echo(f"✅ Removed alias from {config_path}")
                 success = True
             else:
@@ -321,14 +389,8 @@ def install_completion(shell):
     """Install shell completion for samosa command."""
     # Detect shell if auto
     if shell == "auto":
-        shell_path = os.environ.get("SHELL", "").lower()
-        if "zsh" in shell_path:
-            shell = "zsh"
-        elif "bash" in shell_path:
-            shell = "bash"
-        elif "fish" in shell_path:
-            shell = "fish"
-        else:
+        shell = _detect_shell()
+        if shell is None:
             click.echo(
                 "⚠️  Could not auto-detect shell. Please specify: --shell bash|zsh|fish",
                 err=True,
@@ -336,7 +398,7 @@ def install_completion(shell):
             return
 
     # Check if samosa is available
-    samosa_path = shutil.which("samosa")
+    samosa_path = _find_samosa()
     if not samosa_path:
         click.echo("❌ samosa command not found in PATH", err=True)
         click.echo("💡 Make sure samosa is installed globally first")
@@ -346,66 +408,38 @@ def install_completion(shell):
     click.echo(f"🐚 Installing {shell} completion...")
 
     try:
-        if shell == "bash":
-            # Generate bash completion script
-            result = subprocess.run(
-                [samosa_path, "--complete", "bash"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            completion_script = result.stdout
+        completion_script = _completion_script(shell)
+        comp_file = Path(_COMPLETION_FILES[shell]).expanduser()
 
-            # Install to bash completion directory
-            completion_paths = [
-                Path("~/.bash_completion").expanduser(),
-                Path("~/.local/share/bash-completion/completions/samosa").expanduser(),
-            ]
+        if shell == "bash":
+            # Append to ~/.bash_completion unless the marker is already there
+            bash_completion = Path("~/.bash_completion").expanduser()
+            try:
+                with open(bash_completion, "ab+") as f:
+                    completion_exists = _find_any(f, _COMPLETION_MARKER.encode())
+                    if not completion_exists:
+                        section = (
+                            f"\n{_COMPLETION_MARKER}\n"
+                            f"{completion_script.rstrip()}\n"
+                            f"{_COMPLETION_END_MARKER}\n"
+                        )
+                        f.write(section.encode())
+                if completion_exists:
+                    click.echo(f"✅ Completion already exists in {bash_completion}")
+                else:
+                    click.echo(f"✅ Added completion to {bash_completion}")
+            except Exception as e:
+                click.echo(f"⚠️  Failed to write to {bash_completion}: {e}")
 
-            for comp_path in completion_paths:
+                # Fall back to the bash-completion user directory
                 try:
-                    comp_path.parent.mkdir(parents=True, exist_ok=True)
-
-                    # For the completions directory, write to samosa file
-                    if "completions" in str(comp_path):
-                        with open(comp_path, "w") as f:
-                            f.write(completion_script)
-                        click.echo(f"✅ Installed completion to {comp_path}")
-                        break
-                    else:
-                        # For .bash_completion, append
-                        completion_marker = "# Samosa completion"
-                        if comp_path.exists():
-                            with open(comp_path) as f:
-                                if completion_marker in f.read():
-                                    click.echo(
-                                        f"✅ Completion already exists in {comp_path}"
-                                    )
-                                    break
-
-                        with open(comp_path, "a") as f:
-                            f.write(f"\n{completion_marker}\n{completion_script}\n")
-                        click.echo(f"✅ Added completion to {comp_path}")
-                        break
+                    _write_completion_file(comp_file, completion_script)
                 except Exception as e:
-                    click.echo(f"⚠️  Failed to write to {comp_path}: {e}")
-                    continue
-
-        elif shell == "zsh":
-            # For zsh, Click provides built-in completion
-            completion_script = """#compdef samosa
-eval "$(_SAMOSA_COMPLETE=zsh_complete samosa)"
-"""
-
-            # Install to zsh completion directory
-            zsh_comp_dir = Path("~/.zsh/completions").expanduser()
-            zsh_comp_dir.mkdir(parents=True, exist_ok=True)
-
-            comp_file = zsh_comp_dir / "_samosa"
-            with open(comp_file, "w") as f:
-                f.write(completion_script)
-            click.echo(f"✅ Installed completion to {comp_file}")
+                    click.echo(f"⚠️  Failed to write to {comp_file}: {e}")
+        else:
+            _write_completion_file(comp_file, completion_script)
 
+        if shell == "zsh":
             # Add to .zshrc if not already there
             zshrc_path = Path("~/.zshrc").expanduser()
             completion_setup = (
@@ -413,30 +447,16 @@ eval "$(_SAMOSA_COMPLETE=zsh_complete samosa)"
             )
 
             if zshrc_path.exists():
-                with open(zshrc_path) as f:
-                    content = f.read()
-                    if ".zsh/completions" not in content:
-                        with open(zshrc_path, "a") as f:
-                            f.write(
-                                f"\n# Samosa completion setup\n{completion_setup}\n"
-                            )
-                        click.echo(f"✅ Added completion setup to {zshrc_path}")
-                    else:
-                        click.echo(f"✅ Completion setup already in {zshrc_path}")
-
-        elif shell == "fish":
-            # For fish, Click provides built-in completion
-            completion_script = """eval (env _SAMOSA_COMPLETE=fish_complete samosa)
-"""
-
-            # Install to fish completion directory
-            fish_comp_dir = Path("~/.config/fish/completions").expanduser()
-            fish_comp_dir.mkdir(parents=True, exist_ok=True)
-
-            comp_file = fish_comp_dir / "samosa.fish"
-            with open(comp_file, "w") as f:
-                f.write(completion_script)
-            click.echo(f"✅ Installed completion to {comp_file}")
+                with open(zshrc_path, "ab+") as f:
+                    setup_exists = _find_any(f, b".zsh/completions")
+                    if not setup_exists:
+                        f.write(
+                            f"\n# Samosa completion setup\n{completion_setup}\n".encode()
+                        )
+                if setup_exists:
+                    click.echo(f"✅ Completion setup already in {zshrc_path}")
+                else:
+                    click.echo(f"✅ Added completion setup to {zshrc_path}")
 
         click.echo("\n🎉 Shell completion installed successfully!")
         click.echo("\n🔄 To activate completion:")
@@ -452,9 +472,6 @@ eval "$(_SAMOSA_COMPLETE=zsh_complete samosa)"
         click.echo("   samosa git <TAB>     # Show git commands")
         click.echo("   samosa git backup <TAB> # Show backup commands")
 
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ Failed to generate completion script: {e}", err=True)
-        click.echo("💡 Using Click's built-in completion system instead")
     except Exception as e:
         click.echo(f"❌ Error installing completion: {e}", err=True)
 
@@ -470,14 +487,8 @@ def uninstall_completion(shell):
     """Remove shell completion for samosa command."""
     # Detect shell if auto
     if shell == "auto":
-        shell_path = os.environ.get("SHELL", "").lower()
-        if "zsh" in shell_path:
-            shell = "zsh"
-        elif "bash" in shell_path:
-            shell = "bash"
-        elif "fish" in shell_path:
-            shell = "fish"
-        else:
+        shell = _detect_shell()
+        if shell is None:
             click.echo(
                 "⚠️  Could not auto-detect shell. Please specify: --shell bash|zsh|fish",
                 err=True,
@@ -489,65 +500,28 @@ def uninstall_completion(shell):
     success = False
 
     if shell == "bash":
-        # Remove from various bash completion locations
-        completion_paths = [
-            Path("~/.bash_completion").expanduser(),
-            Path("~/.local/share/bash-completion/completions/samosa").expanduser(),
-        ]
-
-        for comp_path in completion_paths:
-            if comp_path.exists():
-                if "completions" in str(comp_path):
-                    # Remove the entire file
-                    comp_path.unlink()
-                    click.echo(f"✅ Removed {comp_path}")
+        # Remove the marked section from ~/.bash_completion
+        bash_completion = Path("~/.bash_completion").expanduser()
+        if _contains(bash_completion, _COMPLETION_MARKER.encode()):
+            try:
+                content = bash_completion.read_text()
+                new_content, removed = _COMPLETION_BLOCK_RE.subn("", content)
+
+                if removed:
+                    _replace_text(bash_completion, new_content)
+                    click.echo(f"✅ Removed completion from {bash_completion}")
                     success = True
-                else:
-                    # Remove from .bash_completion file
-                    try:
-                        with open(comp_path) as f:
-                            lines = f.readlines()
-
-                        new_lines = []
-                        skip_section = False
-
-                        for line in lines:
-                            if "# Samosa completion" in line:
-                                skip_section = True
-                                continue
-                            elif skip_section and line.strip() == "":
-                                skip_section = False
-                                continue
-                            elif not skip_section:
-                                new_lines.append(line)
-
-                        if len(new_lines) != len(lines):
-                            with open(comp_path, "w") as f:
-                                f.writelines(new_lines)
-                            click.echo(f"✅ Removed completion from {comp_path}")
-                            success = True
-                    except Exception as e:
-                        click.echo(f"⚠️  Failed to modify {comp_path}: {e}")
-
-    elif shell == "zsh":
-        # Remove zsh completion file
-        comp_file = Path("~/.zsh/completions/_samosa").expanduser()
-        if comp_file.exists():
-            comp_file.unlink()
-            click.echo(f"✅ Removed {comp_file}")
-            success = True
-        else:
-            click.echo(f"i  No completion file found at {comp_file}")
-
-    elif shell == "fish":
-        # Remove fish completion file
-        comp_file = Path("~/.config/fish/completions/samosa.fish").expanduser()
-        if comp_file.exists():
-            comp_file.unlink()
-            click.echo(f"✅ Removed {comp_file}")
-            success = True
-        else:
-            click.echo(f"i  No completion file found at {comp_file}")
+            except Exception as e:
+                click.echo(f"⚠️  Failed to modify {bash_completion}: {e}")
+
+    # Remove the standalone completion file
+    comp_file = Path(_COMPLETION_FILES[shell]).expanduser()
+    if comp_file.exists():
+        comp_file.unlink()
+        click.echo(f"✅ Removed {comp_file}")
+        success = True
+    elif shell != "bash":
+        click.echo(f"i  No completion file found at {comp_file}")
 
     if success:
         click.echo("\n🗑️  Shell completion removed!")
@@ -1,15 +1,32 @@
 """Plugin system for loading project-specific commands."""
 
+import hashlib
 import importlib.util
 from pathlib import Path
 import sys
-from typing import Dict, Optional
+from types import CodeType
+from typing import Dict, Optional, Tuple
 
 import click
 from invoke import Context
 
 from .utils import AliasedGroup
 
+# Command file path -> (source digest, compiled code)
+_compiled_commands: Dict[str, Tuple[str, CodeType]] = {}
+
+
+def _compile_command_file(path: str) -> CodeType:
+    """Compile a command file, reusing the code while its source is unchanged."""
+    source = Path(path).read_bytes()
+    digest = hashlib.sha1(source).hexdigest()
+    cached = _compiled_commands.get(path)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    code = compile(source, path, "exec")
+    _compiled_commands[path] = (digest, code)
+    return code
+
 
 class ProjectContext:
     """Context object providing project-specific utilities."""
@@ -30,8 +47,7 @@ class ProjectContext:
                 try:
                     import yaml
 
-                    with open(self.config_file) as f:
-                        self._config = yaml.safe_load(f) or {}
+                    self._config = yaml.safe_load(self.config_file.read_text()) or {}
                 except ImportError:
                     # yaml not available, skip config loading
                     pass
@@ -61,23 +77,33 @@ class ProjectCommandLoader:
         self.project_root = None
         self.samosa_dir = None
         self.project_context = None
+        # Resolved start directory -> project root (or None) for this loader
+        self._root_cache: Dict[Path, Optional[Path]] = {}
 
     def find_project_root(self, start_path: Optional[Path] = None) -> Optional[Path]:
-        """Find project root by looking for .samosa directory."""
+        """Find project root by looking for .samosa directory.
+
+        Results are cached per start directory for the life of the loader.
+        """
         if start_path is None:
             start_path = Path.cwd()
 
         current = start_path.resolve()
+        if current in self._root_cache:
+            return self._root_cache[current]
 
+        project_root = None
         # Walk up the directory tree
         for parent in [current, *list(current.parents)]:
             samosa_dir = parent / ".samosa"
             if samosa_dir.is_dir():
                 commands_dir = samosa_dir / "commands"
                 if commands_dir.is_dir():
-                    return parent
+                    project_root = parent
+                    break
 
-        return None
+        self._root_cache[current] = project_root
+        return project_root
 
     def discover_project(self) -> bool:
         """Discover and initialize project context."""
@@ -108,7 +134,8 @@ class ProjectCommandLoader:
                 if py_file.name.startswith("__"):
                     continue  # Skip __init__.py and __pycache__
 
-                module_name = py_file.stem
+                # Interned: used as dict keys for every command lookup
+                module_name = sys.intern(py_file.stem)
                 try:
                     # Load the module
                     spec = importlib.util.spec_from_file_location(module_name, py_file)
@@ -118,14 +145,17 @@ class ProjectCommandLoader:
                         # Inject project_context into module globals
                         module.__dict__["project_context"] = self.project_context
 
-                        spec.loader.exec_module(module)
+                        # Reuse the compiled code while the file is unchanged;
+                        # each load still runs it in a fresh module namespace
+                        code = _compile_command_file(str(py_file))
+                        exec(code, module.__dict__)
 
                         # Look for Click groups or commands in the module
                         for attr_name in dir(module):
                             attr = getattr(module, attr_name)
                             if isinstance(attr, (click.Group, click.Command)):
                                 # Use module name as command name unless it has a different name
-                                command_name = (
+                                command_name = sys.intern(
                                     getattr(attr, "name", None) or module_name
                                 )
                                 commands[command_name] = attr
@@ -161,6 +191,8 @@ class ProjectCommandLoader:
 
                 # Create directory structure
                 commands_dir.mkdir(parents=True)
+                # Cached lookups may still say there is no project here
+                self._root_cache.clear()
 
                 # Create __init__.py
                 (commands_dir / "__init__.py").write_text("")
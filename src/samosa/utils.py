@@ -1,6 +1,7 @@
 """Utility classes and functions for samosa CLI."""
 
 import inspect
+import sys
 
 import click
 from invoke import UnexpectedExit
@@ -12,13 +13,28 @@ class AliasedGroup(click.Group):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._aliases = {}
+        # Inverse of _aliases, each list kept sorted for help output
+        self._aliases_by_target = {}
+        # Rows for the help "Commands" section, built on first render
+        self._formatted_commands = None
+
+    def add_command(self, cmd, name=None):
+        """Add a command and drop the cached help rows."""
+        super().add_command(cmd, name)
+        self._formatted_commands = None
 
     def add_command_with_aliases(self, cmd, name, aliases=None):
         """Add a command with aliases."""
+        name = sys.intern(name)
         self.add_command(cmd, name)
         if aliases:
+            targets = self._aliases_by_target.setdefault(name, [])
             for alias in aliases:
+                alias = sys.intern(alias)
                 self._aliases[alias] = name
+                targets.append(alias)
+            targets.sort()
+            self._formatted_commands = None
 
     def get_command(self, ctx, cmd_name):
         """Get command, resolving aliases to actual command names."""
@@ -27,63 +43,68 @@ class AliasedGroup(click.Group):
             cmd_name = self._aliases[cmd_name]
         return super().get_command(ctx, cmd_name)
 
-    def list_commands(self, ctx):
-        """List commands (without aliases to avoid completion duplicates)."""
-        return super().list_commands(ctx)
-
     def format_commands(self, ctx, formatter):
         """Custom format showing aliases like 'command (alias1, alias2)'."""
+        if self._formatted_commands is None:
+            self._formatted_commands = self._build_command_rows(ctx)
+
+        if self._formatted_commands:
+            with formatter.section("Commands"):
+                formatter.write_dl(self._formatted_commands)
+
+    def _build_command_rows(self, ctx):
+        """Build (name, help) rows for every visible command."""
         commands = []
-        seen = set()
 
+        # list_commands yields only real command names; aliases live in _aliases
         for subcommand in self.list_commands(ctx):
-            if subcommand in seen:
-                continue
             cmd = self.get_command(ctx, subcommand)
             if cmd is None or cmd.hidden:
                 continue
 
             # Find aliases for this command
-            aliases = [
-                alias for alias, target in self._aliases.items() if target == subcommand
-            ]
+            aliases = self._aliases_by_target.get(subcommand, ())
 
-            if aliases:
-                name = f"{subcommand} ({', '.join(sorted(aliases))})"
-            else:
-                name = subcommand
+            name = f"{subcommand} ({', '.join(aliases)})" if aliases else subcommand
 
             commands.append((name, cmd.get_short_help_str()))
-            seen.add(subcommand)
-            # Mark aliases as seen to avoid duplicates
-            for alias in aliases:
-                seen.add(alias)
 
-        if commands:
-            with formatter.section("Commands"):
-                formatter.write_dl(commands)
+        return commands
 
 
-def invoked(f):
-    sig = inspect.signature(f)
-    num_params = len(
-        [
-            p
-            for p in sig.parameters.values()
-            if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
-        ]
+def _positional_count(fn):
+    """Count the positional parameters of ``fn``, ignoring *args and keyword-only."""
+    sig = inspect.signature(fn)
+    return sum(
+        1
+        for p in sig.parameters.values()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
     )
 
-    @click.pass_context
+
+def invoked(f):
+    num_params = _positional_count(f)
+
+    # Resolve the calling convention once, not on every invocation
+    if num_params == 1:
+
+        def call(invoke_ctx, click_ctx, args, kwargs):
+            return f(invoke_ctx, *args, **kwargs)
+
+    elif num_params >= 2:
+
+        def call(invoke_ctx, click_ctx, args, kwargs):
+            return f(invoke_ctx, click_ctx, *args, **kwargs)
+
+    else:
+
+        def call(invoke_ctx, click_ctx, args, kwargs):
+            return f(*args, **kwargs)
+
     def new_func(click_ctx, *args, **kwargs):
         invoke_ctx = click_ctx.obj["invoke_ctx"]
         try:
-            if num_params == 1:
-                return f(invoke_ctx, *args, **kwargs)
-            elif num_params >= 2:
-                return f(invoke_ctx, click_ctx, *args, **kwargs)
-            else:
-                return f(*args, **kwargs)
+            return call(invoke_ctx, click_ctx, args, kwargs)
         except UnexpectedExit as e:
             # Graceful fail: match Invoke CLI style
             click.secho(
@@ -91,4 +112,6 @@ def invoked(f):
             )
             click_ctx.exit(e.result.exited)
 
-    return new_func
+    # Click builds the command help from the callback's docstring
+    new_func.__doc__ = f.__doc__
+    return click.pass_context(new_func)
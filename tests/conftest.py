@@ -1,60 +1,70 @@
 """Pytest configuration and fixtures."""
 
-from pathlib import Path
-import tempfile
-
 from click.testing import CliRunner
 import pytest
-import yaml
 
-from samosa.plugins import ProjectCommandLoader
+from samosa.plugins import ProjectCommandLoader, ProjectContext, get_local_command_group
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Provide a Click CLI runner for testing commands."""
+    """Provide a shared Click CLI runner for testing commands."""
     return CliRunner()
 
 
-@pytest.fixture
-def temp_project_dir():
-    """Create a temporary project directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        project_dir = Path(tmpdir) / "test_project"
-        project_dir.mkdir()
-        yield project_dir
+@pytest.fixture(scope="session")
+def git_cmd():
+    """Provide the git command group, imported on first use."""
+    from samosa.commands.git import git
 
+    return git
 
-@pytest.fixture
-def samosa_project_dir(temp_project_dir):
-    """Create a temporary project with .samosa directory structure."""
-    samosa_dir = temp_project_dir / ".samosa"
-    commands_dir = samosa_dir / "commands"
-    commands_dir.mkdir(parents=True)
 
-    # Create __init__.py
-    (commands_dir / "__init__.py").write_text("")
+@pytest.fixture(scope="session")
+def dev_cmd():
+    """Provide the dev command group, imported on first use."""
+    from samosa.commands.dev import dev
 
-    # Create config.yaml
-    config = {
-        "project": {"name": "Test Project", "version": "1.0.0"},
-        "environments": {
-            "dev": {"url": "http://localhost:3000"},
-            "prod": {"url": "https://prod.example.com"},
-        },
-    }
-    with open(samosa_dir / "config.yaml", "w") as f:
-        yaml.safe_dump(config, f)
+    return dev
 
-    yield temp_project_dir
 
+@pytest.fixture(scope="session")
+def utils_cmd():
+    """Provide the utils command group, imported on first use."""
+    from samosa.commands.utils import utils
+
+    return utils
 
-@pytest.fixture
-def sample_command_file(samosa_project_dir):
-    """Create a sample command file in the project."""
-    commands_dir = samosa_project_dir / ".samosa" / "commands"
 
-    command_content = '''"""Sample project command for testing."""
+@pytest.fixture
+def temp_project_dir(tmp_path):
+    """Create a temporary project directory for testing."""
+    project_dir = tmp_path / "test_project"
+    project_dir.mkdir()
+    return project_dir
+
+
+# Sample project config, kept both as data and as the YAML written to disk
+_CONFIG_DICT = {
+    "project": {"name": "Test Project", "version": "1.0.0"},
+    "environments": {
+        "dev": {"url": "http://localhost:3000"},
+        "prod": {"url": "https://prod.example.com"},
+    },
+}
+
+_CONFIG_YAML = """\
+project:
+  name: Test Project
+  version: 1.0.0
+environments:
+  dev:
+    url: http://localhost:3000
+  prod:
+    url: https://prod.example.com
+"""
+
+SAMPLE_COMMAND = '''"""Sample project command for testing."""
 import click
 
 @click.group()
@@ -76,8 +86,68 @@ def test():
     click.echo("Running project tests...")
 '''
 
-    (commands_dir / "sample.py").write_text(command_content)
-    return commands_dir / "sample.py"
+
+def build_samosa_project(project_dir, with_sample_command=False):
+    """Write a .samosa directory structure under ``project_dir`` and return it."""
+    samosa_dir = project_dir / ".samosa"
+    commands_dir = samosa_dir / "commands"
+    commands_dir.mkdir(parents=True)
+
+    # Create __init__.py
+    (commands_dir / "__init__.py").write_text("")
+
+    # Create config.yaml
+    (samosa_dir / "config.yaml").write_text(_CONFIG_YAML)
+
+    if with_sample_command:
+        (commands_dir / "sample.py").write_text(SAMPLE_COMMAND)
+
+    return project_dir
+
+
+@pytest.fixture
+def expected_config():
+    """Provide the config the sample project's config.yaml should load as."""
+    return _CONFIG_DICT
+
+
+@pytest.fixture
+def make_samosa_project(tmp_path):
+    """Return a factory that builds a fresh .samosa project only when called."""
+
+    def _make(name="test_project", with_sample_command=False):
+        project_dir = tmp_path / name
+        project_dir.mkdir()
+        return build_samosa_project(project_dir, with_sample_command)
+
+    return _make
+
+
+@pytest.fixture(scope="session")
+def shared_samosa_project(tmp_path_factory):
+    """Build one read-only sample project for tests that never modify it."""
+    project_dir = tmp_path_factory.mktemp("samosa_proj")
+    return build_samosa_project(project_dir, with_sample_command=True)
+
+
+@pytest.fixture
+def project_context(shared_samosa_project):
+    """Provide a fresh ProjectContext for the shared sample project."""
+    return ProjectContext(shared_samosa_project, shared_samosa_project / ".samosa")
+
+
+@pytest.fixture
+def samosa_project_dir(temp_project_dir):
+    """Create a temporary project with .samosa directory structure."""
+    return build_samosa_project(temp_project_dir)
+
+
+@pytest.fixture
+def sample_command_file(samosa_project_dir):
+    """Create a sample command file in the project."""
+    command_file = samosa_project_dir / ".samosa" / "commands" / "sample.py"
+    command_file.write_text(SAMPLE_COMMAND)
+    return command_file
 
 
 @pytest.fixture
@@ -91,3 +161,17 @@ def mock_cwd(monkeypatch, samosa_project_dir):
     """Mock the current working directory to point to our test project."""
     monkeypatch.chdir(samosa_project_dir)
     return samosa_project_dir
+
+
+@pytest.fixture
+def empty_local_group(monkeypatch, tmp_path):
+    """Provide the local command group for a directory with no project."""
+    monkeypatch.chdir(tmp_path)
+    return get_local_command_group()
+
+
+@pytest.fixture
+def local_group(monkeypatch, shared_samosa_project):
+    """Provide the local command group for the shared sample project."""
+    monkeypatch.chdir(shared_samosa_project)
+    return get_local_command_group()
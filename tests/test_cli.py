@@ -10,14 +10,13 @@ def test_main_help(cli_runner):
     result = cli_runner.invoke(main, ["--help"])
 
     assert result.exit_code == 0
-    assert "Samosa" in result.output
-    assert "task automation" in result.output.lower()
+    out = result.output
+    assert "Samosa" in out
+    assert "task automation" in out.lower()
 
     # Check that command groups are shown
-    assert "git (g)" in result.output
-    assert "utils (u)" in result.output
-    assert "dev" in result.output
-    assert "local (l)" in result.output
+    needles = ("git (g)", "utils (u)", "dev", "local (l)")
+    assert all(n in out for n in needles), out
 
 
 def test_main_version(cli_runner):
@@ -2,153 +2,161 @@
 
 import pytest
 
-from samosa.commands.dev import dev
-from samosa.commands.git import git
-from samosa.commands.utils import utils
-from samosa.plugins import get_local_command_group
 
-
-# Git Commands Tests
-@pytest.mark.integration
-def test_git_help(cli_runner):
-    """Test git command help."""
-    result = cli_runner.invoke(git, ["--help"])
-
-    assert result.exit_code == 0
-    assert "Git version control" in result.output
-    assert "status" in result.output
-    assert "backup (b)" in result.output
-    assert "worktree (w)" in result.output
-
-
-@pytest.mark.integration
-def test_backup_help(cli_runner):
-    """Test backup subcommand help."""
-    result = cli_runner.invoke(git, ["backup", "--help"])
-
-    assert result.exit_code == 0
-    assert "Backup branch management" in result.output
-    assert "add" in result.output
-    assert "list" in result.output
-    assert "delete" in result.output
+# Help Output Tests
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "group_name, args, needles",
+    [
+        (
+            "git",
+            ["--help"],
+            ["Git version control", "status", "backup (b)", "worktree (w)"],
+        ),
+        (
+            "git",
+            ["backup", "--help"],
+            ["Backup branch management", "add", "list", "delete"],
+        ),
+        (
+            "git",
+            ["worktree", "--help"],
+            ["Git worktree management", "add", "list", "remove"],
+        ),
+        ("git", ["status", "--help"], ["Show git status"]),
+        ("git", ["add", "--help"], ["Add files to git staging"]),
+        ("dev", ["--help"], ["Development", "lint", "test", "format"]),
+        ("dev", ["lint", "--help"], ["--fix"]),
+        ("dev", ["check", "--help"], ["--fast", "--fix"]),
+        ("utils", ["--help"], ["Utility", "info", "env"]),
+    ],
+    ids=[
+        "git",
+        "git-backup",
+        "git-worktree",
+        "git-status",
+        "git-add",
+        "dev",
+        "dev-lint",
+        "dev-check",
+        "utils",
+    ],
+)
+def test_help_text(cli_runner, request, group_name, args, needles):
+    """Test that each command's help mentions its key subcommands and options."""
+    group = request.getfixturevalue(f"{group_name}_cmd")
+    result = cli_runner.invoke(group, args)
+
+    assert result.exit_code == 0
+    out = result.output
+    assert all(n in out for n in needles), out
 
 
+# Utils Commands Tests
 @pytest.mark.integration
-def test_worktree_help(cli_runner):
-    """Test worktree subcommand help."""
-    result = cli_runner.invoke(git, ["worktree", "--help"])
+def test_utils_info(cli_runner, utils_cmd):
+    """Test utils info command."""
+    result = cli_runner.invoke(utils_cmd, ["info"])
 
     assert result.exit_code == 0
-    assert "Git worktree management" in result.output
-    assert "add" in result.output
-    assert "list" in result.output
-    assert "remove" in result.output
+    out = result.output
+    assert "CLI Tool" in out
+    assert "Version:" in out
 
 
 @pytest.mark.integration
-def test_git_status_mock(cli_runner):
-    """Test git status command help."""
-    result = cli_runner.invoke(git, ["status", "--help"])
+def test_utils_env(cli_runner, utils_cmd):
+    """Test utils env command."""
+    result = cli_runner.invoke(utils_cmd, ["env"])
 
     assert result.exit_code == 0
-    assert "Show git status" in result.output
+    out = result.output
+    assert "Python version:" in out
+    assert "Platform:" in out
 
 
 @pytest.mark.integration
-def test_git_add_mock(cli_runner):
-    """Test git add command help."""
-    result = cli_runner.invoke(git, ["add", "--help"])
-
-    assert result.exit_code == 0
-    assert "Add files to git staging" in result.output
+def test_utils_uninstall_alias(cli_runner, utils_cmd, tmp_path, monkeypatch):
+    """Test uninstall-alias removes only the samosa alias lines."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    zshrc = tmp_path / ".zshrc"
+    zshrc.write_text(
+        'export A=1\n\n# Samosa CLI alias\nalias s="samosa"\nalias ll="ls -l"\n'
+    )
 
-
-# Dev Commands Tests
-@pytest.mark.integration
-def test_dev_help(cli_runner):
-    """Test dev command help."""
-    result = cli_runner.invoke(dev, ["--help"])
+    result = cli_runner.invoke(utils_cmd, ["uninstall-alias", "--shell", "zsh"])
 
     assert result.exit_code == 0
-    assert "Development" in result.output
-    assert "lint" in result.output
-    assert "test" in result.output
-    assert "format" in result.output
+    assert "Removed alias" in result.output
+    assert zshrc.read_text() == 'export A=1\n\nalias ll="ls -l"\n'
 
 
 @pytest.mark.integration
-def test_dev_lint_mock(cli_runner):
-    """Test dev lint command with mocked context."""
-    # Just test that the command structure is correct
-    result = cli_runner.invoke(dev, ["lint", "--help"])
+def test_utils_bash_completion_roundtrip(cli_runner, utils_cmd, tmp_path, monkeypatch):
+    """Test the bash completion section is added once and removed whole."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("samosa.commands.utils._find_samosa", lambda: "/usr/bin/samosa")
+    bash_completion = tmp_path / ".bash_completion"
+    bash_completion.write_text("a=1\n")
 
-    assert result.exit_code == 0
-    assert "--fix" in result.output
+    for _ in range(2):
+        result = cli_runner.invoke(utils_cmd, ["install-completion", "--shell", "bash"])
+        assert result.exit_code == 0
+    assert bash_completion.read_text().count("# Samosa completion\n") == 1
 
-
-@pytest.mark.integration
-def test_dev_check_help(cli_runner):
-    """Test dev check command help."""
-    result = cli_runner.invoke(dev, ["check", "--help"])
+    result = cli_runner.invoke(utils_cmd, ["uninstall-completion", "--shell", "bash"])
 
     assert result.exit_code == 0
-    assert "--fast" in result.output
-    assert "--fix" in result.output
+    assert bash_completion.read_text() == "a=1\n"
 
 
-# Utils Commands Tests
 @pytest.mark.integration
-def test_utils_help(cli_runner):
-    """Test utils command help."""
-    result = cli_runner.invoke(utils, ["--help"])
-
-    assert result.exit_code == 0
-    assert "Utility" in result.output
-    assert "info" in result.output
-    assert "env" in result.output
-
-
-@pytest.mark.integration
-def test_utils_info(cli_runner):
-    """Test utils info command."""
-    result = cli_runner.invoke(utils, ["info"])
-
-    assert result.exit_code == 0
-    assert "CLI Tool" in result.output
-    assert "Version:" in result.output
-
-
-@pytest.mark.integration
-def test_utils_env(cli_runner):
-    """Test utils env command."""
-    result = cli_runner.invoke(utils, ["env"])
-
-    assert result.exit_code == 0
-    assert "Python version:" in result.output
-    assert "Platform:" in result.output
+def test_utils_install_alias_needs_samosa_on_path(
+    cli_runner, utils_cmd, tmp_path, monkeypatch
+):
+    """Test that an entry point outside PATH does not count as installed."""
+    from samosa.commands.utils import _find_samosa
+
+    venv_bin = tmp_path / "venv" / "bin"
+    venv_bin.mkdir(parents=True)
+    (venv_bin / "samosa").write_text("")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    monkeypatch.setattr("sys.argv", [str(venv_bin / "samosa")])
+    _find_samosa.cache_clear()
+
+    try:
+        result = cli_runner.invoke(utils_cmd, ["install-alias", "--shell", "zsh"])
+        assert "not found in PATH" in result.output
+        assert not (tmp_path / ".zshrc").exists()
+
+        # Once its directory is on PATH, the running entry point is accepted
+        _find_samosa.cache_clear()
+        monkeypatch.setenv("PATH", str(venv_bin))
+        assert _find_samosa() == str(venv_bin / "samosa")
+    finally:
+        _find_samosa.cache_clear()
 
 
 # Local Commands Tests
 @pytest.mark.integration
-def test_local_group_no_project(cli_runner, tmp_path, monkeypatch):
+def test_local_group_no_project(cli_runner, empty_local_group):
     """Test local group when no project exists."""
-    monkeypatch.chdir(tmp_path)
-
-    local = get_local_command_group()
-    result = cli_runner.invoke(local, ["--help"])
+    result = cli_runner.invoke(empty_local_group, ["--help"])
 
     assert result.exit_code == 0
-    assert "no .samosa directory found" in result.output.lower()
-    assert "init" in result.output
+    out = result.output
+    assert "no .samosa directory found" in out.lower()
+    assert "init" in out
 
 
 @pytest.mark.integration
-def test_local_init_command(cli_runner, tmp_path, monkeypatch):
+@pytest.mark.slow
+def test_local_init_command(cli_runner, tmp_path, empty_local_group):
     """Test local init command creates proper structure."""
-    monkeypatch.chdir(tmp_path)
+    import yaml
 
-    local = get_local_command_group()
-    result = cli_runner.invoke(local, ["init"])
+    result = cli_runner.invoke(empty_local_group, ["init"])
 
     assert result.exit_code == 0
     assert "Initialized .samosa directory" in result.output
@@ -160,46 +168,41 @@ def test_local_init_command(cli_runner, tmp_path, monkeypatch):
     assert (tmp_path / ".samosa" / "commands" / "example.py").exists()
     assert (tmp_path / ".samosa" / "config.yaml").exists()
 
+    # The generated config must be valid YAML with the expected sections
+    config_text = (tmp_path / ".samosa" / "config.yaml").read_text()
+    # libyaml's C loader when PyYAML was built with it
+    config = yaml.load(
+        config_text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    )
+    assert "project" in config
+    assert "environments" in config
+
 
 @pytest.mark.integration
-def test_local_with_project(
-    cli_runner, samosa_project_dir, sample_command_file, monkeypatch
-):
+def test_local_with_project(cli_runner, local_group):
     """Test local group with existing project."""
-    monkeypatch.chdir(samosa_project_dir)
-
-    local = get_local_command_group()
-    result = cli_runner.invoke(local, ["--help"])
+    result = cli_runner.invoke(local_group, ["--help"])
 
     assert result.exit_code == 0
     # Should show discovered commands
-    assert "deploy" in result.output
-    assert "test" in result.output
+    out = result.output
+    assert "deploy" in out
+    assert "test" in out
 
 
 @pytest.mark.integration
-def test_local_command_execution(
-    cli_runner, samosa_project_dir, sample_command_file, monkeypatch
-):
+def test_local_command_execution(cli_runner, local_group):
     """Test executing a project-specific command."""
-    monkeypatch.chdir(samosa_project_dir)
-
-    local = get_local_command_group()
-    result = cli_runner.invoke(local, ["test"])
+    result = cli_runner.invoke(local_group, ["test"])
 
     assert result.exit_code == 0
     assert "Running project tests" in result.output
 
 
 @pytest.mark.integration
-def test_local_nested_command_execution(
-    cli_runner, samosa_project_dir, sample_command_file, monkeypatch
-):
+def test_local_nested_command_execution(cli_runner, local_group):
     """Test executing a nested project-specific command."""
-    monkeypatch.chdir(samosa_project_dir)
-
-    local = get_local_command_group()
-    result = cli_runner.invoke(local, ["deploy", "app", "dev"])
+    result = cli_runner.invoke(local_group, ["deploy", "app", "dev"])
 
     assert result.exit_code == 0
     assert "Deploying Test Project to dev" in result.output
@@ -0,0 +1,209 @@
+"""Tests for samosa.commands.dev helpers."""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from samosa.commands.dev import classify_layout, dev, get_python_paths
+
+# Shared result returned by FakeContext.run
+OK = SimpleNamespace(return_code=0)
+
+
+@dataclass
+class FakeContext:
+    """Minimal stand-in for invoke.Context that records the commands run."""
+
+    calls: List[tuple] = field(default_factory=list)
+    dirs: List[str] = field(default_factory=list)
+
+    @contextmanager
+    def cd(self, path):
+        self.dirs.append(path)
+        yield
+
+    def run(self, cmd, **kwargs):
+        self.calls.append((cmd, kwargs))
+        return OK
+
+
+def test_get_python_paths_standard_layout(tmp_path):
+    """Test that src/ is picked up, with tests/ only on request."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "tests").mkdir()
+
+    assert get_python_paths(tmp_path) == "src"
+    assert get_python_paths(tmp_path, include_tests=True) == "src tests"
+
+
+def test_get_python_paths_flat_layout(tmp_path):
+    """Test fallback to top-level packages for non-standard layouts."""
+    package = tmp_path / "mypkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (tmp_path / "docs").mkdir()
+
+    assert get_python_paths(tmp_path) == "mypkg"
+
+
+def test_get_python_paths_no_packages(tmp_path):
+    """Test that an empty directory falls back to the current directory."""
+    assert get_python_paths(tmp_path) == "."
+
+
+def test_classify_layout(tmp_path):
+    """Test that one scan classifies src, test dirs and packages."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "test").mkdir()
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "tools" / "__init__.py").write_text("")
+    (tmp_path / ".hidden").mkdir()
+
+    layout = classify_layout(tmp_path)
+
+    assert layout.has_src is True
+    assert layout.test_dirs == ("tests", "test")
+    assert layout.packages == ("tools",)
+
+
+class TestDevMocked:
+    """Dev commands run against a FakeContext from an empty project directory."""
+
+    @pytest.fixture(autouse=True)
+    def _fake_context(self, cli_runner, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        self.runner = cli_runner
+        self.tmp_path = tmp_path
+        self.fake = FakeContext()
+
+    def invoke(self, args):
+        return self.runner.invoke(dev, args, obj={"invoke_ctx": self.fake})
+
+    def test_lint_runs_ruff(self):
+        """Test that lint runs ruff in the current directory."""
+        result = self.invoke(["lint", "--fix"])
+
+        assert result.exit_code == 0
+        assert self.fake.calls == [("ruff check . --fix", {})]
+        assert self.fake.dirs == []
+
+    def test_lint_from_subdirectory_stays_put(self, monkeypatch):
+        """Test that lint does not jump to the repository root."""
+        (self.tmp_path / ".git").mkdir()
+        (self.tmp_path / "docs").mkdir()
+        monkeypatch.chdir(self.tmp_path / "docs")
+
+        result = self.invoke(["lint"])
+
+        assert result.exit_code == 0
+        assert self.fake.dirs == []
+        assert "Using git repository root" not in result.output
+
+    def test_format_check(self):
+        """Test that format --check passes --check to black."""
+        result = self.invoke(["fmt", "--check"])
+
+        assert result.exit_code == 0
+        assert self.fake.calls == [("black . --check", {})]
+
+    def test_mypy_checks_src_unless_tests_requested(self):
+        """Test that mypy keeps to src/ and adds tests/ only with --tests."""
+        (self.tmp_path / "src").mkdir()
+        (self.tmp_path / "tests").mkdir()
+
+        assert self.invoke(["mypy"]).exit_code == 0
+        assert self.invoke(["mypy", "--tests"]).exit_code == 0
+        assert self.fake.calls == [("mypy src", {}), ("mypy src tests", {})]
+
+    def test_check_fast_skips_tests(self):
+        """Test that check --fast runs lint and mypy but not pytest."""
+        (self.tmp_path / "src").mkdir()
+
+        result = self.invoke(["check", "--fast"])
+
+        assert result.exit_code == 0
+        assert self.fake.calls == [("ruff check .", {}), ("mypy src", {})]
+        assert "Skipping pytest (--fast)" in result.output
+
+    def test_check_from_subdirectory_runs_at_repo_root(self, monkeypatch):
+        """Test that check resolves the git root and runs every step there."""
+        root = self.tmp_path
+        (root / ".git").mkdir()
+        (root / "tests").mkdir()
+        (root / "docs").mkdir()
+        monkeypatch.chdir(root / "docs")
+
+        result = self.invoke(["check"])
+
+        assert result.exit_code == 0
+        assert f"Using git repository root: {root}" in result.output
+        assert self.fake.dirs == [str(root)]
+        assert self.fake.calls[-1] == ("pytest tests", {"pty": True})
+
+    def test_test_proxies_arguments(self):
+        """Test that extra arguments are passed straight through to pytest."""
+        result = self.invoke(["test", "-k", "smoke", "-x"])
+
+        assert result.exit_code == 0
+        assert self.fake.calls == [("pytest -k smoke -x", {"pty": True})]
+
+    def test_clean_removes_artifacts(self):
+        """Test that clean removes build dirs and caches but keeps egg-info."""
+        root = self.tmp_path
+        (root / "build").mkdir()
+        (root / ".coverage").write_text("")
+        (root / "src" / "pkg" / "__pycache__").mkdir(parents=True)
+        (root / "src" / "pkg.egg-info").mkdir()
+        (root / "src" / "pkg" / "module.py").write_text("")
+
+        result = self.invoke(["clean"])
+
+        assert result.exit_code == 0
+        assert not (root / "build").exists()
+        assert not (root / ".coverage").exists()
+        assert not (root / "src" / "pkg" / "__pycache__").exists()
+        assert (root / "src" / "pkg.egg-info").exists()
+        assert (root / "src" / "pkg" / "module.py").exists()
+
+    def test_clean_all_removes_egg_info(self):
+        """Test that clean --all also removes egg-info metadata."""
+        (self.tmp_path / "src" / "pkg.egg-info").mkdir(parents=True)
+
+        result = self.invoke(["clean", "--all"])
+
+        assert result.exit_code == 0
+        assert not (self.tmp_path / "src" / "pkg.egg-info").exists()
+
+    def test_clean_skips_virtualenvs_and_dot_dirs(self):
+        """Test that clean leaves installed package metadata alone."""
+        root = self.tmp_path
+        site = root / ".venv" / "lib" / "site-packages"
+        (site / "dep-1.0.egg-info").mkdir(parents=True)
+        venv = root / "myenv"
+        (venv / "lib" / "dep.egg-info").mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("")
+        (root / "node_modules" / "x" / "__pycache__").mkdir(parents=True)
+
+        result = self.invoke(["clean", "--all"])
+
+        assert result.exit_code == 0
+        assert (site / "dep-1.0.egg-info").exists()
+        assert (venv / "lib" / "dep.egg-info").exists()
+        assert (root / "node_modules" / "x" / "__pycache__").exists()
+
+    def test_clean_from_subdirectory_cleans_repo_root(self, monkeypatch):
+        """Test that clean resolves the git root like the other dev commands."""
+        root = self.tmp_path
+        (root / ".git").mkdir()
+        (root / "build").mkdir()
+        (root / "docs").mkdir()
+        monkeypatch.chdir(root / "docs")
+
+        result = self.invoke(["clean"])
+
+        assert result.exit_code == 0
+        assert not (root / "build").exists()
@@ -0,0 +1,259 @@
+"""Tests for samosa.commands.git helpers."""
+
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import click
+import pytest
+
+from samosa.commands import git as git_module
+from samosa.commands.git import (
+    _current_branch,
+    _has_local_branch,
+    _is_registered_worktree,
+    _parse_github_url,
+    _parse_ls_remote,
+    _worktree_path,
+    _worktrees,
+)
+
+
+def test_current_branch_reads_head(tmp_path, monkeypatch):
+    """Test that the branch name is read from .git/HEAD without running git."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/feat/some-feature\n")
+    subdir = tmp_path / "src"
+    subdir.mkdir()
+    monkeypatch.chdir(subdir)
+
+    assert _current_branch(SimpleNamespace()) == "feat/some-feature"
+
+
+def test_find_git_dir_does_not_cache_misses(tmp_path):
+    """Test that a repository created after a failed lookup is still found."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    assert git_module._find_git_dir(project) is None
+
+    (project / ".git").mkdir()
+
+    assert git_module._find_git_dir(project) == project / ".git"
+
+
+def test_current_branch_follows_worktree_gitdir(tmp_path, monkeypatch):
+    """Test that a worktree's .git file is followed to its git directory."""
+    gitdir = tmp_path / "main" / ".git" / "worktrees" / "feature"
+    gitdir.mkdir(parents=True)
+    (gitdir / "HEAD").write_text("ref: refs/heads/feature\n")
+    worktree = tmp_path / "feature"
+    worktree.mkdir()
+    (worktree / ".git").write_text(f"gitdir: {gitdir}\n")
+    monkeypatch.chdir(worktree)
+
+    assert _current_branch(SimpleNamespace()) == "feature"
+
+
+def test_current_branch_detached_and_cached(tmp_path, monkeypatch):
+    """Test detached HEAD yields an empty name and the result is cached."""
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("0123456789abcdef\n")
+    monkeypatch.chdir(tmp_path)
+    ctx = SimpleNamespace()
+
+    assert _current_branch(ctx) == ""
+
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    assert _current_branch(ctx) == ""
+
+
+@pytest.mark.parametrize(
+    "remote_url",
+    [
+        "git@github.com:user/repo.git",
+        "git@github.com:user/repo",
+        "https://github.com/user/repo.git",
+        "https://github.com/user/repo",
+        "https://github.com/user/repo/",
+        "https://github.com/user/repo.git/",
+    ],
+)
+def test_parse_github_url(remote_url):
+    """Test that supported GitHub remote formats resolve to user and repo."""
+    assert _parse_github_url(remote_url) == ("user", "repo")
+
+
+def test_parse_github_url_rejects_other_hosts():
+    """Test that non-GitHub remotes are not parsed."""
+    assert _parse_github_url("https://gitlab.com/user/repo.git") is None
+    assert _parse_github_url("https://github.com/user") is None
+    assert _parse_github_url("https://github.com/user/repo/tree/main") is None
+
+
+def test_has_local_branch_loose_and_packed(tmp_path, monkeypatch):
+    """Test local branch lookup in loose refs and packed-refs."""
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs" / "heads" / "feat").mkdir(parents=True)
+    (git_dir / "refs" / "heads" / "feat" / "loose").write_text("0" * 40 + "\n")
+    (git_dir / "packed-refs").write_text(
+        "# pack-refs with: peeled fully-peeled sorted\n"
+        f"{'1' * 40} refs/heads/packed\n"
+        f"{'2' * 40} refs/remotes/origin/remote-only\n"
+    )
+    monkeypatch.chdir(tmp_path)
+
+    assert _has_local_branch("feat/loose") is True
+    assert _has_local_branch("packed") is True
+    assert _has_local_branch("remote-only") is False
+    assert _has_local_branch("feat") is False
+
+
+def test_worktree_path(tmp_path, monkeypatch):
+    """Test that worktrees live next to the project as project-branch."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    monkeypatch.chdir(project)
+
+    assert _worktree_path("feat/some-feature") == tmp_path / "proj-feat-some-feature"
+
+
+def test_parse_ls_remote():
+    """Test that ls-remote output parses to exact ref names."""
+    output = f"{'0' * 40}\trefs/heads/feat/x\n{'1' * 40}\trefs/heads/x-old\n"
+
+    refs = _parse_ls_remote(output)
+
+    assert refs == {"refs/heads/feat/x", "refs/heads/x-old"}
+    assert "refs/heads/x" not in refs
+
+
+def test_worktrees_parses_porcelain(monkeypatch):
+    """Test that porcelain blocks parse into a dict keyed by path."""
+    porcelain = (
+        "worktree /src/proj\nHEAD aaaa\nbranch refs/heads/main\n\n"
+        "worktree /src/proj-fix\nHEAD bbbb\ndetached\n\n"
+    )
+    monkeypatch.setattr(
+        git_module,
+        "_git",
+        lambda *args, **kwargs: SimpleNamespace(
+            returncode=0, stdout=porcelain, stderr=""
+        ),
+    )
+
+    assert _worktrees() == {
+        "/src/proj": {"HEAD": "aaaa", "branch": "refs/heads/main"},
+        "/src/proj-fix": {"HEAD": "bbbb", "detached": ""},
+    }
+
+
+def test_worktrees_reports_git_failure(monkeypatch):
+    """Test that a failing worktree listing raises git's message."""
+    monkeypatch.setattr(
+        git_module,
+        "_git",
+        lambda *args, **kwargs: SimpleNamespace(
+            returncode=128, stdout="", stderr="fatal: not a git repository\n"
+        ),
+    )
+
+    with pytest.raises(click.ClickException, match="not a git repository"):
+        _worktrees()
+
+
+def test_is_registered_worktree_normalizes_paths(tmp_path, monkeypatch):
+    """Test that registration matches git's spelling of an equivalent path."""
+    worktree = tmp_path / "proj-fix"
+    worktree.mkdir()
+    # git prints forward slashes and may not match Path's own spelling
+    porcelain = f"worktree {tmp_path.as_posix()}/./proj-fix\nHEAD bbbb\n\n"
+    monkeypatch.setattr(
+        git_module,
+        "_git",
+        lambda *args, **kwargs: SimpleNamespace(
+            returncode=0, stdout=porcelain, stderr=""
+        ),
+    )
+
+    assert _is_registered_worktree(worktree)
+    assert not _is_registered_worktree(tmp_path / "proj-other")
+
+
+def test_worktree_add_reaps_remote_query_on_error(cli_runner, tmp_path, monkeypatch):
+    """Test that a failure before the ls-remote result is read kills the query."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    monkeypatch.chdir(project)
+
+    started = []
+
+    def fake_start(*args):
+        proc = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        started.append(proc)
+        return proc
+
+    def fail(path):
+        raise click.ClickException("fatal: not a git repository")
+
+    monkeypatch.setattr(git_module, "_has_local_branch", lambda branch: False)
+    monkeypatch.setattr(git_module, "_git_start", fake_start)
+    monkeypatch.setattr(git_module, "_is_registered_worktree", fail)
+
+    result = cli_runner.invoke(
+        git_module.git, ["worktree", "add", "feat"], obj={"invoke_ctx": object()}
+    )
+
+    assert result.exit_code != 0
+    assert len(started) == 1
+    assert started[0].returncode is not None
+
+
+def test_worktree_add_falls_back_when_ls_remote_fails(
+    cli_runner, tmp_path, monkeypatch
+):
+    """Test that a failed ls-remote falls back to remote-tracking refs."""
+    project = tmp_path / "proj"
+    project.mkdir()
+    monkeypatch.chdir(project)
+
+    def fake_start(*args):
+        return subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import sys; sys.stderr.write('fatal: unable to access origin\\n');"
+                " sys.exit(128)",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+    checked = []
+
+    def fake_git(*args, **kwargs):
+        checked.append(args)
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    calls = []
+    fake_ctx = SimpleNamespace(run=lambda cmd, **kwargs: calls.append(cmd))
+
+    monkeypatch.setattr(git_module, "_has_local_branch", lambda branch: False)
+    monkeypatch.setattr(git_module, "_git_start", fake_start)
+    monkeypatch.setattr(git_module, "_is_registered_worktree", lambda path: False)
+    monkeypatch.setattr(git_module, "_git", fake_git)
+
+    result = cli_runner.invoke(
+        git_module.git, ["worktree", "add", "feat"], obj={"invoke_ctx": fake_ctx}
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Could not query origin (fatal: unable to access origin)" in result.output
+    assert checked[0] == ("show-ref", "--verify", "--quiet", "refs/remotes/origin/feat")
+    assert len(calls) == 1
+    assert calls[0].startswith("git worktree add -b feat ")
+    assert calls[0].endswith(" origin/feat")
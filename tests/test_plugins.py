@@ -1,50 +1,42 @@
 """Tests for samosa.plugins module."""
 
-from unittest.mock import patch
+import os
+from pathlib import Path
+import sys
 
 import click
+import pytest
 import yaml
 
 from samosa.plugins import ProjectCommandLoader, ProjectContext
 
 
 # ProjectContext Tests
-def test_project_context_initialization(samosa_project_dir):
+def test_project_context_initialization(project_context, shared_samosa_project):
     """Test that ProjectContext initializes correctly."""
-    samosa_dir = samosa_project_dir / ".samosa"
-    context = ProjectContext(samosa_project_dir, samosa_dir)
+    samosa_dir = shared_samosa_project / ".samosa"
 
-    assert context.project_root == samosa_project_dir
-    assert context.samosa_dir == samosa_dir
-    assert context.config_file == samosa_dir / "config.yaml"
-    assert context._config is None
-    assert context._invoke_context is None
+    assert project_context.project_root == shared_samosa_project
+    assert project_context.samosa_dir == samosa_dir
+    assert project_context.config_file == samosa_dir / "config.yaml"
+    assert project_context._config is None
+    assert project_context._invoke_context is None
 
 
-def test_config_loading(samosa_project_dir):
+def test_config_loading(project_context, expected_config):
     """Test that configuration is loaded correctly."""
-    samosa_dir = samosa_project_dir / ".samosa"
-    context = ProjectContext(samosa_project_dir, samosa_dir)
+    config = project_context.config
 
-    config = context.config
-
-    assert config is not None
-    assert config["project"]["name"] == "Test Project"
-    assert config["project"]["version"] == "1.0.0"
-    assert config["environments"]["dev"]["url"] == "http://localhost:3000"
-    assert config["environments"]["prod"]["url"] == "https://prod.example.com"
+    assert config == expected_config
 
 
-def test_config_caching(samosa_project_dir):
+def test_config_caching(project_context):
     """Test that configuration is cached after first load."""
-    samosa_dir = samosa_project_dir / ".samosa"
-    context = ProjectContext(samosa_project_dir, samosa_dir)
-
     # First access loads config
-    config1 = context.config
+    config1 = project_context.config
 
     # Second access should return cached config
-    config2 = context.config
+    config2 = project_context.config
 
     assert config1 is config2  # Same object reference
 
@@ -59,14 +51,17 @@ def test_config_missing_file(temp_project_dir):
     assert config == {}
 
 
-def test_config_invalid_yaml(temp_project_dir):
+def test_config_invalid_yaml(temp_project_dir, monkeypatch):
     """Test behavior with invalid YAML config."""
     samosa_dir = temp_project_dir / ".samosa"
     samosa_dir.mkdir()
+    (samosa_dir / "config.yaml").write_text("")
+
+    # Exercise the error handler without making PyYAML parse anything
+    def raise_yaml_error(*args, **kwargs):
+        raise yaml.YAMLError("boom")
 
-    # Create invalid YAML
-    config_file = samosa_dir / "config.yaml"
-    config_file.write_text("invalid: yaml: content: [")
+    monkeypatch.setattr(yaml, "safe_load", raise_yaml_error)
 
     context = ProjectContext(temp_project_dir, samosa_dir)
 
@@ -75,32 +70,31 @@ def test_config_invalid_yaml(temp_project_dir):
     assert config == {}
 
 
-def test_invoke_context(samosa_project_dir):
+def test_invoke_context(project_context):
     """Test invoke context creation and working directory."""
-    samosa_dir = samosa_project_dir / ".samosa"
-    context = ProjectContext(samosa_project_dir, samosa_dir)
-
-    invoke_ctx = context.invoke_ctx
+    invoke_ctx = project_context.invoke_ctx
 
     assert invoke_ctx is not None
     # Note: We can't easily test the working directory change without
     # actually changing directories, but we can test that it returns
     # the same context on subsequent calls
-    assert context.invoke_ctx is invoke_ctx  # Same object
+    assert project_context.invoke_ctx is invoke_ctx  # Same object
 
 
-def test_run_method(samosa_project_dir):
+def test_run_method(project_context, monkeypatch):
     """Test the run method delegates to invoke context."""
-    samosa_dir = samosa_project_dir / ".samosa"
-    context = ProjectContext(samosa_project_dir, samosa_dir)
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append((command, kwargs))
+        return "test output"
 
-    with patch.object(context.invoke_ctx, "run") as mock_run:
-        mock_run.return_value = "test output"
+    monkeypatch.setattr(project_context.invoke_ctx, "run", fake_run)
 
-        result = context.run("echo test", hide=True)
+    result = project_context.run("echo test", hide=True)
 
-        mock_run.assert_called_once_with("echo test", hide=True)
-        assert result == "test output"
+    assert calls == [("echo test", {"hide": True})]
+    assert result == "test output"
 
 
 # ProjectCommandLoader Tests
@@ -113,53 +107,62 @@ def test_initialization():
     assert loader.project_context is None
 
 
-def test_find_project_root_success(samosa_project_dir, mock_cwd):
+def test_find_project_root_success(shared_samosa_project, monkeypatch):
     """Test finding project root when .samosa directory exists."""
+    monkeypatch.chdir(shared_samosa_project)
     loader = ProjectCommandLoader()
 
     project_root = loader.find_project_root()
 
-    assert project_root.resolve() == samosa_project_dir.resolve()
+    assert project_root.resolve() == shared_samosa_project.resolve()
 
 
-def test_find_project_root_parent_directory(samosa_project_dir, monkeypatch):
+def test_find_project_root_parent_directory(make_samosa_project):
     """Test finding project root in parent directory."""
-    # Create a subdirectory and set it as cwd
-    subdir = samosa_project_dir / "subdir" / "deep"
-    subdir.mkdir(parents=True)
+    project_dir = make_samosa_project()
 
-    monkeypatch.chdir(subdir)
+    # Start the search from a nested subdirectory
+    subdir = project_dir / "subdir" / "deep"
+    subdir.mkdir(parents=True)
 
     loader = ProjectCommandLoader()
-    project_root = loader.find_project_root()
+    project_root = loader.find_project_root(start_path=subdir)
 
-    assert project_root.resolve() == samosa_project_dir.resolve()
+    assert project_root.resolve() == project_dir.resolve()
 
 
-def test_find_project_root_not_found(temp_project_dir, monkeypatch):
+def test_find_project_root_not_found(temp_project_dir):
     """Test behavior when no .samosa directory is found."""
-    monkeypatch.chdir(temp_project_dir)
-
     loader = ProjectCommandLoader()
-    project_root = loader.find_project_root()
+    project_root = loader.find_project_root(start_path=temp_project_dir)
 
     assert project_root is None
 
 
-def test_find_project_root_no_commands_dir(temp_project_dir, monkeypatch):
+def test_find_project_root_no_commands_dir(temp_project_dir):
     """Test behavior when .samosa exists but no commands directory."""
-    monkeypatch.chdir(temp_project_dir)
-
     # Create .samosa but no commands subdirectory
     samosa_dir = temp_project_dir / ".samosa"
     samosa_dir.mkdir(exist_ok=True)
 
     loader = ProjectCommandLoader()
-    project_root = loader.find_project_root()
+    project_root = loader.find_project_root(start_path=temp_project_dir)
 
     assert project_root is None
 
 
+def test_find_project_root_cached_per_loader(temp_project_dir):
+    """Test that a cached miss is reused by its loader but not by new loaders."""
+    loader = ProjectCommandLoader()
+    assert loader.find_project_root(start_path=temp_project_dir) is None
+
+    (temp_project_dir / ".samosa" / "commands").mkdir(parents=True)
+
+    assert loader.find_project_root(start_path=temp_project_dir) is None
+    project_root = ProjectCommandLoader().find_project_root(start_path=temp_project_dir)
+    assert project_root == temp_project_dir.resolve()
+
+
 def test_discover_project_success(mock_cwd):
     """Test successful project discovery."""
     loader = ProjectCommandLoader()
@@ -173,14 +176,14 @@ def test_discover_project_success(mock_cwd):
     assert isinstance(loader.project_context, ProjectContext)
 
 
-def test_discover_project_failure(temp_project_dir, mock_cwd):
+def test_discover_project_failure(temp_project_dir, mock_cwd, monkeypatch):
     """Test project discovery failure."""
     # Switch to directory without .samosa
     loader = ProjectCommandLoader()
 
-    # Mock find_project_root to return None
-    with patch.object(loader, "find_project_root", return_value=None):
-        result = loader.discover_project()
+    # Make find_project_root report no project
+    monkeypatch.setattr(loader, "find_project_root", lambda start_path=None: None)
+    result = loader.discover_project()
 
     assert result is False
     assert loader.project_root is None
@@ -188,12 +191,12 @@ def test_discover_project_failure(temp_project_dir, mock_cwd):
     assert loader.project_context is None
 
 
-def test_load_commands_no_project(temp_project_dir):
+def test_load_commands_no_project(temp_project_dir, monkeypatch):
     """Test loading commands when no project is found."""
     loader = ProjectCommandLoader()
 
-    with patch.object(loader, "discover_project", return_value=False):
-        commands = loader.load_commands()
+    monkeypatch.setattr(loader, "discover_project", lambda: False)
+    commands = loader.load_commands()
 
     assert commands == {}
 
@@ -214,6 +217,57 @@ def test_load_commands_with_sample_file(mock_cwd, sample_command_file):
     assert isinstance(commands["test"], click.Command)
 
 
+def test_load_commands_reuses_compiled_code_until_edited(mock_cwd):
+    """Test that repeat loads run fresh modules and pick up file edits."""
+    command_file = mock_cwd / ".samosa" / "commands" / "hello.py"
+    command_file.write_text(
+        "import click\n\n@click.command()\ndef hello():\n    pass\n"
+    )
+
+    first = ProjectCommandLoader().load_commands()["hello"]
+    second = ProjectCommandLoader().load_commands()["hello"]
+
+    # Same code, but each load builds its own command objects
+    assert first is not second
+
+    command_file.write_text(
+        "import click\n\n@click.command(name='hi')\ndef hello():\n    pass\n"
+    )
+    os.utime(command_file, ns=(0, 0))
+
+    commands = ProjectCommandLoader().load_commands()
+    assert "hi" in commands
+    assert "hello" not in commands
+
+
+def test_load_commands_sees_same_size_edit_with_same_mtime(mock_cwd):
+    """Test that an edit keeping both size and mtime is still recompiled."""
+    command_file = mock_cwd / ".samosa" / "commands" / "hello.py"
+    command_file.write_text("import click\n\nhi = click.Command('aa')\n")
+    os.utime(command_file, ns=(0, 0))
+    assert "aa" in ProjectCommandLoader().load_commands()
+
+    command_file.write_text("import click\n\nhi = click.Command('bb')\n")
+    os.utime(command_file, ns=(0, 0))
+
+    commands = ProjectCommandLoader().load_commands()
+    assert "bb" in commands
+    assert "aa" not in commands
+
+
+def test_load_commands_leaves_import_state_untouched(mock_cwd, sample_command_file):
+    """Test that loading commands registers nothing in sys.modules or sys.path."""
+    modules_before = set(sys.modules)
+    path_before = list(sys.path)
+
+    commands = ProjectCommandLoader().load_commands()
+
+    assert "deploy" in commands
+    assert "sample" not in sys.modules
+    assert not set(sys.modules) - modules_before
+    assert sys.path == path_before
+
+
 def test_load_commands_ignores_invalid_files(mock_cwd):
     """Test that invalid Python files are ignored."""
     commands_dir = mock_cwd / ".samosa" / "commands"
@@ -267,85 +321,61 @@ def test_project_context_injection(mock_cwd, sample_command_file):
     assert isinstance(injected_context, ProjectContext)
 
 
-def test_create_local_group_no_project(temp_project_dir, monkeypatch):
-    """Test creating local group when no project is found."""
-    monkeypatch.chdir(temp_project_dir)
-
-    loader = ProjectCommandLoader()
-    local_group = loader.create_local_group()
-
-    assert local_group is not None
-    assert isinstance(local_group, click.Group)
-
-    # Should have init command
-    commands = local_group.list_commands(None)
-    assert "init" in commands
-
-
-def test_create_local_group_with_project_no_commands(mock_cwd):
-    """Test creating local group with project but no commands."""
-    # Remove sample command file if it exists
-    commands_dir = mock_cwd / ".samosa" / "commands"
-    for py_file in commands_dir.glob("*.py"):
-        if py_file.name != "__init__.py":
-            py_file.unlink()
-
-    loader = ProjectCommandLoader()
-    local_group = loader.create_local_group()
-
-    assert local_group is not None
-    assert isinstance(local_group, click.Group)
+def _prepare_project(state, make_samosa_project, tmp_path):
+    """Lay out the directory for one create_local_group scenario."""
+    if state == "no_project":
+        return tmp_path
+    return make_samosa_project(with_sample_command=state == "with_commands")
 
-    # Should have info command when no commands are found
-    commands = local_group.list_commands(None)
-    assert "info" in commands
 
+@pytest.mark.parametrize(
+    "state, expected_cmds",
+    [
+        ("no_project", {"init"}),
+        ("project_no_commands", {"info"}),
+        ("with_commands", {"deploy", "test"}),
+    ],
+)
+def test_create_local_group(
+    make_samosa_project, tmp_path, monkeypatch, state, expected_cmds
+):
+    """Test the local group's commands for each project layout."""
+    monkeypatch.chdir(_prepare_project(state, make_samosa_project, tmp_path))
 
-def test_create_local_group_with_commands(mock_cwd, sample_command_file):
-    """Test creating local group with discovered commands."""
     loader = ProjectCommandLoader()
     local_group = loader.create_local_group()
 
-    assert local_group is not None
     assert isinstance(local_group, click.Group)
-
-    # Should have discovered commands
-    commands = local_group.list_commands(None)
-    assert "deploy" in commands
-    assert "test" in commands
+    assert expected_cmds <= set(local_group.list_commands(None))
 
 
-def test_init_command_creates_structure(temp_project_dir, monkeypatch):
+def test_init_command_creates_structure(cli_runner, tmp_path):
     """Test that init command creates proper directory structure."""
-    monkeypatch.chdir(temp_project_dir)
-
-    loader = ProjectCommandLoader()
-    local_group = loader.create_local_group()
-
-    from click.testing import CliRunner
-
-    runner = CliRunner()
+    with cli_runner.isolated_filesystem(temp_dir=tmp_path) as td:
+        loader = ProjectCommandLoader()
+        local_group = loader.create_local_group()
 
-    result = runner.invoke(local_group, ["init"])
+        result = cli_runner.invoke(local_group, ["init"])
 
     assert result.exit_code == 0
 
-    # Check that directories were created
-    samosa_dir = temp_project_dir / ".samosa"
-    assert samosa_dir.exists()
-    assert (samosa_dir / "commands").exists()
-    assert (samosa_dir / "commands" / "__init__.py").exists()
-    assert (samosa_dir / "commands" / "example.py").exists()
-    assert (samosa_dir / "config.yaml").exists()
+    # Check that directories were created, collecting the tree in one walk
+    samosa_dir = Path(td) / ".samosa"
+    names = {p.relative_to(samosa_dir).as_posix() for p in samosa_dir.rglob("*")}
+    assert {
+        "commands",
+        "commands/__init__.py",
+        "commands/example.py",
+        "config.yaml",
+    } <= names
 
-    # Check config content
-    with open(samosa_dir / "config.yaml") as f:
-        config = yaml.safe_load(f)
-    assert "project" in config
-    assert "environments" in config
+    # Check config content; test_local_init_command parses it in full
+    data = (samosa_dir / "config.yaml").read_bytes()
+    assert b"project:" in data
+    assert b"environments:" in data
 
 
-def test_init_command_already_exists(mock_cwd):
+def test_init_command_already_exists(cli_runner, mock_cwd, monkeypatch):
     """Test init command when .samosa directory already exists."""
     # Since we're in a directory with .samosa, we get the project version of local group
     # which doesn't have init command, so we should test against no-project version
@@ -354,19 +384,15 @@ def test_init_command_already_exists(mock_cwd):
     # Create a loader but force it to think there's no project
     loader = ProjectCommandLoader()
 
-    # Patch find_project_root to return None to simulate no project
-    with patch.object(loader, "find_project_root", return_value=None):
-        local_group = loader.create_local_group()
-
-    from click.testing import CliRunner
-
-    runner = CliRunner()
+    # Make find_project_root return None to simulate no project
+    monkeypatch.setattr(loader, "find_project_root", lambda start_path=None: None)
+    local_group = loader.create_local_group()
 
     # Create the .samosa directory first
     samosa_dir = mock_cwd / ".samosa"
     samosa_dir.mkdir(exist_ok=True)
 
-    result = runner.invoke(local_group, ["init"])
+    result = cli_runner.invoke(local_group, ["init"])
 
     assert result.exit_code == 0
     assert "already exists" in result.output
@@ -1,14 +1,12 @@
 """Tests for samosa.utils module."""
 
 import click
-from click.testing import CliRunner
 import pytest
 
 from samosa.utils import AliasedGroup
 
 
-@pytest.fixture
-def sample_group():
+def _build_sample_group():
     """Create a sample AliasedGroup for testing."""
 
     @click.group(cls=AliasedGroup)
@@ -32,6 +30,18 @@ def sample_group():
     return main
 
 
+def _help_text(group):
+    """Render a group's --help text directly, without CliRunner."""
+    with click.Context(group) as ctx:
+        return group.get_help(ctx)
+
+
+@pytest.fixture(scope="module")
+def sample_group():
+    """Share one read-only sample group across the module."""
+    return _build_sample_group()
+
+
 def test_add_command_with_aliases(sample_group):
     """Test that commands are added with proper aliases."""
     # Check that the main command is available
@@ -48,6 +58,9 @@ def test_add_command_with_aliases(sample_group):
     assert sample_group._aliases["a"] == "another"
     assert sample_group._aliases["alt"] == "another"
 
+    # Check inverse mapping used for help output
+    assert sample_group._aliases_by_target == {"test": ["t"], "another": ["a", "alt"]}
+
 
 def test_get_command_with_alias(sample_group):
     """Test that get_command resolves aliases correctly."""
@@ -96,50 +109,47 @@ def test_list_commands_excludes_aliases(sample_group):
 
 def test_format_commands_shows_aliases(sample_group):
     """Test that format_commands shows clean alias format."""
-    runner = CliRunner()
-    result = runner.invoke(sample_group, ["--help"])
-
     # Check that help shows the clean format with aliases
-    assert result.exit_code == 0
-    help_output = result.output
+    help_output = _help_text(sample_group)
 
     # Should show commands with aliases in parentheses
     assert "test (t)" in help_output
     assert "another (a, alt)" in help_output
 
-    # Should not show duplicate entries
-    lines = help_output.split("\n")
-    test_lines = [line for line in lines if "test" in line.lower()]
-    # Should only have one line with test command (not separate entries)
-    command_lines = [line for line in test_lines if "test (t)" in line]
-    assert len(command_lines) == 1
+    # Should only list the test command once (not separate alias entries)
+    assert help_output.count("test (t)") == 1
 
 
-def test_command_execution_via_alias(sample_group):
-    """Test that commands execute correctly when called via aliases."""
-    runner = CliRunner()
+def test_format_commands_cache_invalidated_on_add():
+    """Test that adding a command after a help render refreshes the listing."""
+    # This test mutates the group, so it builds its own
+    sample_group = _build_sample_group()
+    assert "late" not in _help_text(sample_group)
 
-    # Test execution via main name
-    result = runner.invoke(sample_group, ["test"])
-    assert result.exit_code == 0
-    assert "test command executed" in result.output
+    @click.command()
+    def late():
+        """Added after the first help render."""
 
-    # Test execution via alias
-    result = runner.invoke(sample_group, ["t"])
-    assert result.exit_code == 0
-    assert "test command executed" in result.output
+    sample_group.add_command_with_aliases(late, "late", aliases=["l"])
 
-    # Test multiple aliases
-    result = runner.invoke(sample_group, ["a"])
-    assert result.exit_code == 0
-    assert "another command executed" in result.output
-
-    result = runner.invoke(sample_group, ["alt"])
-    assert result.exit_code == 0
-    assert "another command executed" in result.output
+    assert "late (l)" in _help_text(sample_group)
 
 
-def test_empty_aliases_list():
+def test_command_execution_via_alias(cli_runner, sample_group):
+    """Test that commands execute correctly when called via aliases."""
+    cases = (
+        ("test", "test command executed"),  # main name
+        ("t", "test command executed"),  # alias
+        ("a", "another command executed"),  # multiple aliases
+        ("alt", "another command executed"),
+    )
+    for name, expected in cases:
+        result = cli_runner.invoke(sample_group, [name], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert expected in result.output
+
+
+def test_empty_aliases_list(cli_runner):
     """Test that commands work with empty aliases list."""
 
     @click.group(cls=AliasedGroup)
@@ -153,19 +163,16 @@ def test_empty_aliases_list():
 
     main.add_command_with_aliases(no_alias, name="no-alias", aliases=[])
 
-    runner = CliRunner()
-
     # Should work with main name
-    result = runner.invoke(main, ["no-alias"])
+    result = cli_runner.invoke(main, ["no-alias"])
     assert result.exit_code == 0
     assert "no alias command" in result.output
 
     # Help should show command without aliases
-    result = runner.invoke(main, ["--help"])
-    assert result.exit_code == 0
-    assert "no-alias" in result.output
+    out = _help_text(main)
+    assert "no-alias" in out
     # Should not show empty parentheses
-    assert "no-alias ()" not in result.output
+    assert "no-alias ()" not in out
 
 
 def test_single_alias():
@@ -182,9 +189,5 @@ def test_single_alias():
 
     main.add_command_with_aliases(single, name="single", aliases=["s"])
 
-    runner = CliRunner()
-    result = runner.invoke(main, ["--help"])
-    assert result.exit_code == 0
-
     # Should show single alias format
-    assert "single (s)" in result.output
+    assert "single (s)" in _help_text(main)